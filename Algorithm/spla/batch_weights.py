@@ -0,0 +1,138 @@
+import numpy as np
+from signed_graph import row_search
+
+
+def row_positions(starts, lengths):
+    """
+    Concatenated CSR positions of the rows starting at starts, and the index of the row every position comes from.
+    """
+    owners = np.repeat(np.arange(len(starts)), lengths)
+    offsets = np.arange(len(owners)) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+    return np.repeat(starts, lengths) + offsets, owners
+
+
+def csr_keys(graph):
+    """
+    Sorted int64 key ``row * node_count + col`` of every CSR position.
+    """
+    return graph.csr_rows().astype(np.int64) * graph.node_count + graph.indices
+
+
+def common_neighbors(indptr, indices, keys, sources, targets):
+    """
+    Every common neighbor of the endpoints of the edges (sources[i], targets[i]). The row of the endpoint with
+    fewer neighbors is looked up in the row of the other one by binary search over keys, or over the row itself
+    when keys is None, so an edge costs O(min degree * log) and the row of a hub is never scanned for its low
+    degree neighbors.
+
+    :return: Edge of every common neighbor, its CSR position in the source row and in the target row.
+    """
+    node_count = len(indptr) - 1
+    swapped = indptr[sources + 1] - indptr[sources] > indptr[targets + 1] - indptr[targets]
+    small = np.where(swapped, targets, sources)
+    large = np.where(swapped, sources, targets)
+    small_at, edges = row_positions(indptr[small], indptr[small + 1] - indptr[small])
+    if keys is None:
+        large_at = row_search(indptr, indices, large[edges], indices[small_at])
+        found = large_at < indptr[large[edges] + 1]
+        found[found] = indices[large_at[found]] == indices[small_at[found]]
+    else:
+        probes = large[edges].astype(np.int64) * node_count + indices[small_at]
+        large_at = np.minimum(np.searchsorted(keys, probes), max(len(keys) - 1, 0))
+        found = keys[large_at] == probes if len(keys) else np.zeros(len(probes), dtype=bool)
+    edges, small_at, large_at = edges[found], small_at[found], large_at[found]
+    flip = swapped[edges]
+    return edges, np.where(flip, large_at, small_at), np.where(flip, small_at, large_at)
+
+
+def edge_metrics(metric_names, indptr, indices, keys, signs, norms, sources, targets):
+    """
+    calculation_helper metrics named metric_names for the edges (sources[i], targets[i]), read from CSR arrays.
+    The common neighbors are found once and every metric is derived from them.
+
+    :return: List with one float64 array per metric.
+    """
+    count = len(sources)
+    results = []
+    if set(metric_names) - set(["unit"]):
+        edges, source_at, target_at = common_neighbors(indptr, indices, keys, sources, targets)
+        source_signs = signs[source_at]
+        target_signs = signs[target_at]
+        common = np.bincount(edges, minlength=count).astype(np.float64)
+        source_degrees = indptr[sources + 1] - indptr[sources]
+        target_degrees = indptr[targets + 1] - indptr[targets]
+    for metric_name in metric_names:
+        if metric_name == "unit":
+            results.append(np.ones(count))
+        elif metric_name == "overlap":
+            same = (source_signs > 0) & (target_signs > 0) | (source_signs < 0) & (target_signs < 0)
+            results.append(np.bincount(edges, weights=same, minlength=count).astype(np.float64))
+        elif metric_name == "mea_sim":
+            products = np.where((source_signs < 0) & (target_signs < 0), 0.0, source_signs * target_signs)
+            results.append(np.bincount(edges, weights=products, minlength=count) / (norms[sources] * norms[targets]))
+        elif metric_name == "min_norm":
+            results.append(common / np.minimum(source_degrees, target_degrees))
+        else:
+            results.append(common / (source_degrees + target_degrees - common))
+    return results
+
+
+def squared_norms(graph):
+    """
+    Sum of the squared edge signs of every row.
+    """
+    return np.bincount(graph.csr_rows(), weights=np.square(graph.weights.astype(np.float64)),
+                       minlength=graph.node_count)
+
+
+def edge_chunks(graph, sources, targets, chunks):
+    """
+    Cuts the edges (sources[i], targets[i]) into about chunks ranges of equal work, the smaller endpoint degree.
+    """
+    degrees = graph.degrees
+    work = np.cumsum(np.minimum(degrees[sources], degrees[targets]) + 1)
+    if not len(work):
+        return []
+    cuts = np.searchsorted(work, work[-1] * np.arange(1, chunks) / float(chunks))
+    bounds = np.unique(np.concatenate([[0], cuts, [len(sources)]]))
+    return list(zip(bounds[:-1].tolist(), bounds[1:].tolist()))
+
+
+def local_edge_weights(graph, metric_name, edges):
+    """
+    Metric of the undirected edges with ids edges, in one batch. Only the rows of their endpoints are read, so
+    a handful of edges costs a handful of rows however large the graph is.
+    """
+    sources = graph.edge_sources[edges]
+    targets = graph.edge_targets[edges]
+    endpoints = np.unique(np.concatenate([sources, targets]))
+    at, owners = row_positions(graph.indptr[endpoints], graph.indptr[endpoints + 1] - graph.indptr[endpoints])
+    norms = np.zeros(graph.node_count)
+    norms[endpoints] = np.bincount(owners, weights=np.square(graph.weights[at].astype(np.float64)),
+                                   minlength=len(endpoints))
+    return edge_metrics([metric_name], graph.indptr, graph.indices, None, graph.weights, norms, sources, targets)[0]
+
+
+def batch_edge_weights(graph, metric_names, edges=None, budget=1 << 22):
+    """
+    Evaluates calculation_helper metrics once per undirected edge of a SignedGraph. All the metrics are
+    symmetric, so one weight per edge serves both of its CSR positions. The edges are cut into chunks of about
+    budget row lookups, so the probes are never held for the whole graph. All metrics come out of the same
+    common neighbor pass.
+
+    :param metric_names: Names of the metrics.
+    :param edges: Ids of the undirected edges to evaluate, all of them by default.
+    :return: float64 array with the weight of every evaluated edge in one row per metric.
+    """
+    sources = graph.edge_sources if edges is None else graph.edge_sources[edges]
+    targets = graph.edge_targets if edges is None else graph.edge_targets[edges]
+    keys = csr_keys(graph)
+    signs = graph.weights.astype(np.float64)
+    norms = squared_norms(graph)
+    degrees = graph.degrees
+    chunks = int((np.minimum(degrees[sources], degrees[targets]) + 1).sum()) // budget + 1
+    weights = np.zeros((len(metric_names), len(sources)))
+    for start, end in edge_chunks(graph, sources, targets, chunks):
+        weights[:, start:end] = edge_metrics(metric_names, graph.indptr, graph.indices, keys, signs, norms,
+                                             sources[start:end], targets[start:end])
+    return weights
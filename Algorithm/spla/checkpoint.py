@@ -0,0 +1,71 @@
+import os
+import pickle
+import threading
+import numpy as np
+
+replace = getattr(os, "replace", os.rename)
+
+
+class Checkpoint(object):
+    """
+    On-disk state of a propagation run, kept in a directory.
+
+    The propagation weights are written once to ``weights.npy``. Labels alternate between the memory-mapped
+    ``labels_0.npy`` and ``labels_1.npy`` and ``state.pkl`` (round counter, history) names the slot
+    that was last completed, so a crash in the middle of a write still leaves the previous checkpoint intact.
+    Writes happen in a background thread on a copy of the labels.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        if not os.path.isdir(path):
+            os.makedirs(path)
+        self.slot = 0
+        self.writer = None
+
+    def file(self, name):
+        return os.path.join(self.path, name)
+
+    def save_weights(self, weights):
+        out = np.lib.format.open_memmap(self.file("weights.npy"), mode="w+", dtype=weights.dtype,
+                                        shape=weights.shape)
+        out[:] = weights
+        out.flush()
+        del out
+
+    def save(self, labels, state):
+        """
+        Copies labels and queues a checkpoint, after the previous one has been written.
+        """
+        self.wait()
+        self.slot = 1 - self.slot
+        self.writer = threading.Thread(target=self.write, args=(np.array(labels), dict(state, slot=self.slot)))
+        self.writer.start()
+
+    def write(self, labels, state):
+        out = np.lib.format.open_memmap(self.file("labels_%d.npy" % state["slot"]), mode="w+", dtype=labels.dtype,
+                                        shape=labels.shape)
+        out[:] = labels
+        out.flush()
+        del out
+        with open(self.file("state.pkl.tmp"), "wb") as handle:
+            pickle.dump(state, handle, protocol=2)
+        replace(self.file("state.pkl.tmp"), self.file("state.pkl"))
+
+    def wait(self):
+        if self.writer is not None:
+            self.writer.join()
+            self.writer = None
+
+    def load(self):
+        """
+        :return: Labels, weights and state of the last completed checkpoint, or None when there is none.
+        """
+        if not os.path.exists(self.file("state.pkl")):
+            return None
+        with open(self.file("state.pkl"), "rb") as handle:
+            state = pickle.load(handle)
+        self.slot = state["slot"]
+        labels = np.array(np.load(self.file("labels_%d.npy" % state["slot"]), mmap_mode="r"))
+        weights = np.load(self.file("weights.npy"), mmap_mode="r")
+        return labels, weights, state
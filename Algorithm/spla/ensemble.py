@@ -0,0 +1,109 @@
+import copy
+import multiprocessing
+import numpy as np
+
+# graph, weights and arguments of the running ensemble, set by attach_ensemble in every worker
+state = {}
+
+
+def attach_ensemble(graph, weights, args):
+    """
+    Pool initializer: keeps the shared inputs of the seed runs.
+    """
+    state["graph"] = graph
+    state["weights"] = weights
+    state["args"] = args
+
+
+def run_seed(seed):
+    """
+    Runs one label propagation from singleton labels and returns its label array.
+    """
+    from full_Spl import LabelPropagator
+
+    args = copy.copy(state["args"])
+    args.seed = seed
+    args.telemetry_output = None
+    args.checkpoint = None
+    if args.mode == "parallel":
+        args.mode = "async"
+    graph = state["graph"]
+    graph.labels = np.arange(graph.node_count, dtype=np.int32)
+    model = LabelPropagator(graph, args, state["weights"])
+    model.do_a_series_of_propagations()
+    return np.array(model.signed_graph.labels)
+
+
+def run_seeds(graph, weights, args, seeds, workers):
+    """
+    Runs one propagation per seed concurrently.
+
+    :return: Label matrix with one row per seed.
+    """
+    pool = multiprocessing.Pool(workers, initializer=attach_ensemble, initargs=(graph, weights, args))
+    try:
+        return np.array(pool.map(run_seed, seeds), dtype=np.int32)
+    finally:
+        pool.close()
+        pool.join()
+
+
+def co_association(graph, partitions):
+    """
+    Fraction of the partitions that put the two endpoints of every undirected edge in the same community.
+    Only graph edges are counted, so the matrix is never materialised beyond the edge list.
+    """
+    agree = partitions[:, graph.edge_sources] == partitions[:, graph.edge_targets]
+    return agree.mean(axis=0)
+
+
+def connected_components(node_count, sources, targets):
+    """
+    Labels every node with the smallest node id of its component, by min-label propagation with shortcutting.
+    """
+    parent = np.arange(node_count, dtype=np.int32)
+    while True:
+        previous = parent.copy()
+        np.minimum.at(parent, sources, parent[targets])
+        np.minimum.at(parent, targets, parent[sources])
+        parent = parent[parent]
+        if np.array_equal(parent, previous):
+            return parent
+
+
+def community_stability(graph, labels, agreement):
+    """
+    Mean co-association of the internal edges of every community. Communities without internal edges are left out.
+    """
+    internal = labels[graph.edge_sources] == labels[graph.edge_targets]
+    communities = labels[graph.edge_sources[internal]]
+    totals = np.bincount(communities, weights=agreement[internal], minlength=graph.node_count)
+    counts = np.bincount(communities, minlength=graph.node_count)
+    present = np.flatnonzero(counts)
+    return dict(zip(present.tolist(), (totals[present] / counts[present]).tolist()))
+
+
+def consensus_partition(graph, weights, args, seeds, workers, threshold=0.5, max_iterations=10):
+    """
+    Consensus clustering of an ensemble of label propagations.
+
+    The seeds are run on the graph, the edges whose co-association falls below threshold are dropped and the
+    seeds are run again on the consensus graph, weighted by co-association, until every run agrees on every
+    kept edge or max_iterations is reached. The consensus partition is the set of connected components of the
+    last consensus graph.
+
+    :return: Consensus labels, per-community stability over the first ensemble and the number of iterations.
+    """
+    partitions = run_seeds(graph, weights, args, seeds, workers)
+    agreement = co_association(graph, partitions)
+    first_agreement = agreement
+    iterations = 1
+    while iterations < max_iterations and not np.all(agreement[agreement >= threshold] == 1):
+        consensus = np.where(agreement >= threshold, agreement, 0.0)
+        partitions = run_seeds(graph, consensus[graph.edge_index], args, seeds, workers)
+        agreement = co_association(graph, partitions)
+        iterations = iterations + 1
+
+    kept = agreement >= threshold
+    labels = connected_components(graph.node_count, graph.edge_sources[kept], graph.edge_targets[kept])
+    return labels, community_stability(graph, labels, first_agreement), iterations
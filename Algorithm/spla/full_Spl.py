@@ -1,98 +1,533 @@
-import networkx as nx
-import random
+import numpy as np
 from tqdm import tqdm
 from parser import parameter_parser
-from graph_io import graph_reader
+from graph_io import graph_reader, ground_truth_reader, json_dumper
+from signed_graph import SignedGraph
+from propagation import best_labels, synchronous_sweep, unsatisfied_count
+from parallel import ColoredPropagation
+from slpa import SpeakerListener
+from sampling import HubSampler
+from modularity import ModularityTracker, batch_modularity
+from batch_weights import local_edge_weights, row_positions
+from parallel_weights import parallel_edge_weights
+from minhash import approximate_normalized_overlap
+from weight_cache import WeightCache
+from ensemble import consensus_partition
+from checkpoint import Checkpoint
+from rng import draw_index, round_state, stream_key
+import jit_kernels
+import time
 import evalouation.evaluator as eval
 
 #from community import modularity
 import pandas as pd
-from calculation_helper import overlap, unit, min_norm, normalized_overlap,mea_sim,  overlap_generator
+from calculation_helper import overlap, unit, min_norm, normalized_overlap,mea_sim
 #from print_and_read import json_dumper
 
+def weighting_metric(weighting):
+    """
+    calculation_helper metric of a --weighting name, normalized_overlap for any unknown name.
+    """
+    if weighting == "overlap":
+        return overlap
+    elif weighting == "unit":
+        return unit
+    elif weighting == "min_norm":
+        return min_norm
+    elif weighting == "mea_sim":
+        return mea_sim
+    return normalized_overlap
+
+def weighting_name(weighting, args):
+    """
+    Name of the propagation weights of a --weighting, with the MinHash parameters when they are estimated.
+    It keys the weight cache and is checked when a checkpoint is resumed.
+    """
+    name = weighting_metric(weighting).__name__
+    if name == "normalized_overlap" and args.minhash_degree > 0:
+        name = name + "_minhash_{}_{}_{}".format(args.minhash_degree, args.minhash_size, args.seed)
+    return name
+
+def shared_weight_setup(graph, weightings, args):
+    """
+    Propagation weights of several weightings of a SignedGraph. The exact metrics are evaluated once per
+    undirected edge in one common neighbor pass over args.workers processes. With --minhash-degree,
+    normalized_overlap is estimated from MinHash signatures on the edges between high degree nodes. With
+    --weight-cache the weights of a graph and weighting seen before are memory-mapped from the cache instead.
+
+    :return: ``{weighting: weight of every CSR position}``.
+    """
+    metrics = dict((weighting_name(weighting, args), weighting_metric(weighting).__name__) for weighting in weightings)
+    weights = {}
+    cache = None
+    if args.weight_cache:
+        cache = WeightCache(args.weight_cache, args.weight_cache_size * 2 ** 20)
+        for name in metrics:
+            cached = cache.load(graph, name)
+            if cached is not None:
+                weights[name] = cached
+    missing = [name for name in metrics if name not in weights]
+    exact = [name for name in missing if name == metrics[name]]
+    if exact:
+        weights.update(zip(exact, map(graph.edge_weights, parallel_edge_weights(graph, exact, args.workers))))
+    for name in missing:
+        if name not in weights:
+            estimated, report = approximate_normalized_overlap(graph, args.minhash_degree, args.minhash_size,
+                                                               args.seed, args.workers)
+            weights[name] = graph.edge_weights(estimated)
+            print("MinHash estimated edges: {estimated_edges} Hubs: {hubs} Mean error: {mean_error:.4f} "
+                  "Max error: {max_error:.4f} over {checked_edges} exact edges".format(**report))
+        if cache is not None:
+            cache.store(graph, name, weights[name])
+    return dict((weighting, weights[weighting_name(weighting, args)]) for weighting in weightings)
+
 class LabelPropagator:
 
-    def __init__(self, graph, args):
+    def __init__(self, graph, args, weights=None):
 
         """
+        :param graph: networkx graph of graph_reader, or a SignedGraph that is propagated in place.
+        :param weights: Precomputed propagation weight of every CSR position, skips weight_setup.
         """
         self.args = args
         self.seeding = args.seed
         self.graph = graph
-        self.nodes = list(graph.nodes())
+        if isinstance(graph, SignedGraph):
+            self.signed_graph = graph
+        else:
+            self.signed_graph = SignedGraph.from_networkx(graph)
         self.rounds = args.rounds
-        self.labels = {node: node for node in self.nodes}
-        self.label_count = len(set(self.labels.values()))
+        self.mode = args.mode
+        self.damping = args.damping
+        self.rows = None
+        self.workers = args.workers
+        self.engine = None
+        self.memory = None
+        self.sampler = None
+        self.tracker = None
+        self.active = None
+        self.frontier_sizes = []
+        self.edge_visits = 0
+        self.convergence_threshold = args.convergence_threshold
+        self.history = []
         self.flag = True
-        self.weight_setup(args.weighting)
+        self.round = 0
+        # kept for the edges touched by add_edges and remove_edges, whatever the weights came from
+        self.metric = weighting_metric(args.weighting)
+        self.checkpoint = Checkpoint(args.checkpoint) if args.checkpoint else None
+        restored = self.checkpoint is not None and args.resume and self.restore()
+        if restored:
+            pass
+        elif weights is None:
+            self.weight_setup(args.weighting)
+        else:
+            self.weights = weights
+        if self.checkpoint is not None and not restored:
+            self.checkpoint.save_weights(self.weights)
+
+    @property
+    def labels(self):
+        """
+        Current assignment as ``{node: label}`` in original node names.
+        """
+        return self.signed_graph.label_map()
 
     def weight_setup(self, weighting):
         """
+        Sets the metric of the weighting and the propagation weight of every CSR position, see
+        shared_weight_setup.
         """
+        self.metric = weighting_metric(weighting)
+        self.weights = shared_weight_setup(self.signed_graph, [weighting], self.args)[weighting]
 
-        if weighting == "overlap":
-            self.weights  = overlap_generator(overlap, self.graph)
-        elif weighting == "unit":
-            self.weights  = overlap_generator(unit, self.graph)
-        elif weighting == "min_norm":
-            self.weights  = overlap_generator(min_norm, self.graph)
-        elif weighting == "mea_sim":
-            self.weights = overlap_generator(mea_sim, self.graph)
-        else:
-            self.weights  = overlap_generator(normalized_overlap, self.graph)
+    def make_a_pick(self, source):
+        """
+        Scores the labels of the CSR row of source and returns one of the best, drawn from the stream of the
+        current round.
+        """
+        top = best_labels(self.signed_graph.indptr, self.signed_graph.indices, self.weights,
+                          self.signed_graph.labels, source)
+        if not top:
+            return self.signed_graph.labels[source]
+        return top[draw_index(stream_key(self.seeding, self.round), source, len(top))]
+
+    def neighborhoods(self):
+        """
+        CSR arrays read by an async or frontier round: the graph itself, or with --degree-cap its capped view
+        with freshly drawn hub rows.
+        """
+        if not self.args.degree_cap:
+            return self.signed_graph.indptr, self.signed_graph.indices, self.weights
+        if self.sampler is None:
+            self.sampler = HubSampler(self.signed_graph, self.weights, self.args.degree_cap)
+        self.sampler.resample(stream_key(self.seeding, self.round, 3))
+        return self.sampler.indptr, self.sampler.indices, self.sampler.weights
+
+    def do_an_asynchronous_propagation(self):
+        """
+        Updates the nodes one at a time in a shuffled order, in the compiled kernel when numba is installed.
+        """
+        graph = self.signed_graph
+        changed = 0
+        unsatisfied = 0
+        key = stream_key(self.seeding, self.round)
+        order = round_state(self.seeding, self.round).permutation(graph.node_count)
+        indptr, indices, weights = self.neighborhoods()
+        if jit_kernels.available:
+            return jit_kernels.sweep(indptr, indices, weights, graph.labels, order, np.uint64(key),
+                                     np.zeros(0, dtype=bool), False, *jit_kernels.scratch(graph.node_count))
+        for node in tqdm(order.tolist()):
+            top = best_labels(indptr, indices, weights, graph.labels, node)
+            if not top:
+                continue
+            if graph.labels[node] not in top:
+                unsatisfied = unsatisfied + 1
+            pick = top[draw_index(key, node, len(top))]
+            if pick != graph.labels[node]:
+                graph.labels[node] = pick
+                changed = changed + 1
+        return changed, unsatisfied
+
+    def do_a_frontier_propagation(self):
+        """
+        Updates only the active nodes, in a shuffled order. The neighbors of every node that changed label form
+        the frontier of the next round, since the move changes their label scores. A round with an empty frontier
+        ends the propagation. Under --degree-cap a hub only wakes the neighbors it sampled.
+        """
+        graph = self.signed_graph
+        changed = 0
+        unsatisfied = 0
+        if self.active is None:
+            self.active = np.ones(graph.node_count, dtype=bool)
+        frontier = np.flatnonzero(self.active)
+        frontier = frontier[round_state(self.seeding, self.round).permutation(len(frontier))]
+        key = stream_key(self.seeding, self.round)
+        indptr, indices, weights = self.neighborhoods()
+        self.frontier_sizes.append(len(frontier))
+        self.edge_visits = self.edge_visits + int((indptr[frontier + 1] - indptr[frontier]).sum())
+        self.active = np.zeros(graph.node_count, dtype=bool)
+        if jit_kernels.available:
+            return jit_kernels.sweep(indptr, indices, weights, graph.labels, frontier, np.uint64(key), self.active,
+                                     True, *jit_kernels.scratch(graph.node_count))
+        for node in tqdm(frontier.tolist()):
+            top = best_labels(indptr, indices, weights, graph.labels, node)
+            if not top:
+                continue
+            if graph.labels[node] not in top:
+                unsatisfied = unsatisfied + 1
+            pick = top[draw_index(key, node, len(top))]
+            if pick != graph.labels[node]:
+                graph.labels[node] = pick
+                changed = changed + 1
+                self.active[indices[indptr[node]:indptr[node + 1]]] = True
+        return changed, unsatisfied
+
+    def do_a_synchronous_propagation(self):
+        """
+        Updates every node at once from the labels of the previous round.
+        """
+        if self.rows is None:
+            self.rows = self.signed_graph.csr_rows()
+        self.signed_graph.labels, changed, unsatisfied = synchronous_sweep(self.signed_graph, self.signed_graph.labels,
+                                                                           self.weights, self.rows, self.damping,
+                                                                           self.seeding, self.round)
+        return changed, unsatisfied
 
-    def make_a_pick(self, source, neighbors):
+    def do_a_parallel_propagation(self):
         """
+        Updates the colour classes one after the other, each class in parallel over the worker pool.
         """
+        if self.engine is None:
+            self.engine = ColoredPropagation(self.signed_graph, self.weights, self.workers)
+            self.signed_graph.labels = self.engine.labels
+        return self.engine.sweep(self.seeding, self.round)
 
-        scores = {}
-        for neighbor in neighbors:
-            neighbor_label = self.labels[neighbor]
-            if neighbor_label in scores.keys():
-                scores[neighbor_label] = scores[neighbor_label] +  self.weights[(neighbor,source)]
-            else:
-                scores[neighbor_label] = self.weights[(neighbor,source)]
-        top = [key for key,val in scores.iteritems() if val == max(scores.values())]
-        return random.sample(top,1)[0]
+    def do_a_speaker_listener_propagation(self):
+        """
+        Runs one SLPA round, the labels follow the dominant label of every memory.
+        """
+        if self.memory is None:
+            self.memory = SpeakerListener(self.signed_graph, self.weights, self.args.memory_size)
+        return self.memory.step(self.seeding, self.round)
 
     def do_a_propagation(self):
         """
+        Runs one round and records it in the history, with the signed modularity followed by the tracker. The
+        propagation has converged once every node holds a maximal label, or once at most convergence_threshold
+        of the nodes changed label, or proposed to in sync mode. SLPA memories keep growing while the dominant
+        labels hold still, so slpa mode only stops once no node hears a new label. With --modularity-patience it
+        also stops once the modularity has not improved for that many rounds.
         """
-        #random.seed(self.seeding)
-        print(sorted(self.nodes))
-        print(type(self.nodes))
-        random.shuffle(self.nodes)
-        for node in tqdm(self.nodes):
-             neighbors = nx.neighbors(self.graph, node)
-             pick = self.make_a_pick(node, neighbors)
-             self.labels[node] = pick
-        current_label_count = len(set(self.labels.values()))
-        if self.label_count == current_label_count:
-            self.flag = False
+        start = time.time()
+        if self.mode == "sync":
+            changed, unsatisfied = self.do_a_synchronous_propagation()
+        elif self.mode == "parallel":
+            changed, unsatisfied = self.do_a_parallel_propagation()
+        elif self.mode == "frontier":
+            changed, unsatisfied = self.do_a_frontier_propagation()
+        elif self.mode == "slpa":
+            changed, unsatisfied = self.do_a_speaker_listener_propagation()
         else:
-            self.label_count = current_label_count
+            changed, unsatisfied = self.do_an_asynchronous_propagation()
+        # damping only holds sync moves back, a round whose moves were all rejected has not settled
+        moves = unsatisfied if self.mode == "sync" else changed
+        if self.mode != "slpa":
+            unsatisfied = self.confirm_unsatisfied(unsatisfied)
+        record = {"round": len(self.history) + 1,
+                  "changed": changed,
+                  "unsatisfied": unsatisfied,
+                  "labels": int(np.count_nonzero(np.bincount(self.signed_graph.labels,
+                                                             minlength=self.signed_graph.node_count))),
+                  "modularity": self.track_modularity(),
+                  "seconds": time.time() - start}
+        self.history.append(record)
+        print("Changed: {changed} Unsatisfied: {unsatisfied} Labels: {labels} Q: {modularity:.4f} "
+              "Time: {seconds:.3f}s".format(**record))
+        settled = moves <= self.convergence_threshold * self.signed_graph.node_count and self.mode != "slpa"
+        if unsatisfied == 0 or settled or self.modularity_stalled():
+            self.flag = False
+
+    def confirm_unsatisfied(self, unsatisfied, nodes=None):
+        """
+        A node found maximal when it was visited can lose that to a later move of the same round, so a round that
+        reports no unsatisfied node is recounted on the final labels before it may stop the propagation. Only
+        nodes are recounted when given, from their own rows.
+        """
+        if unsatisfied:
+            return unsatisfied
+        if nodes is not None:
+            graph = self.signed_graph
+            unsatisfied = 0
+            for node in nodes.tolist():
+                top = best_labels(graph.indptr, graph.indices, self.weights, graph.labels, node)
+                if top and graph.labels[node] not in top:
+                    unsatisfied = unsatisfied + 1
+            return unsatisfied
+        if self.rows is None:
+            self.rows = self.signed_graph.csr_rows()
+        return unsatisfied_count(self.signed_graph, self.signed_graph.labels, self.weights, self.rows)
+
+    def track_modularity(self):
+        """
+        Moves the tracker to the current labels and returns the signed modularity.
+        """
+        if self.tracker is None:
+            self.tracker = ModularityTracker(self.signed_graph, self.signed_graph.labels)
+        return self.tracker.update(self.signed_graph.labels)
+
+    def modularity_stalled(self):
+        """
+        True once the last modularity_patience rounds did not beat the best modularity of the rounds before.
+        """
+        patience = self.args.modularity_patience
+        if not patience or len(self.history) <= patience:
+            return False
+        recent = [record.get("modularity", float("-inf")) for record in self.history[-patience:]]
+        earlier = [record.get("modularity", float("-inf")) for record in self.history[:-patience]]
+        return max(recent) <= max(earlier)
 
 
+    def save_checkpoint(self):
+        """
+        Queues a checkpoint of the labels and the round counter, which with the seed fixes every later draw.
+        """
+        state = {"round": self.round,
+                 "flag": self.flag,
+                 "history": list(self.history),
+                 "weighting": weighting_name(self.args.weighting, self.args),
+                 "active": self.active,
+                 "memory": None if self.memory is None else (self.memory.memory_labels.copy(),
+                                                             self.memory.memory_counts.copy()),
+                 "node_count": self.signed_graph.node_count,
+                 "edge_count": self.signed_graph.edge_count}
+        self.checkpoint.save(self.signed_graph.labels, state)
 
-    def do_a_series_of_propagations(self):
+    def restore(self):
+        """
+        Resumes from the last checkpoint, weights included. Returns False when there is nothing to resume.
+        """
+        saved = self.checkpoint.load()
+        if saved is None:
+            return False
+        labels, weights, state = saved
+        if (state["node_count"], state["edge_count"]) != (self.signed_graph.node_count, self.signed_graph.edge_count):
+            raise ValueError("Checkpoint in " + self.checkpoint.path + " belongs to another graph.")
+        if state.get("weighting") != weighting_name(self.args.weighting, self.args):
+            raise ValueError("Checkpoint in " + self.checkpoint.path + " holds " + str(state.get("weighting")) +
+                             " weights, not " + weighting_name(self.args.weighting, self.args) + ".")
+        self.signed_graph.labels = labels
+        self.weights = weights
+        self.round = state["round"]
+        self.flag = state["flag"]
+        self.history = state["history"]
+        self.active = state["active"]
+        if state.get("memory") is not None:
+            self.memory = SpeakerListener(self.signed_graph, self.weights, self.args.memory_size)
+            self.memory.memory_labels, self.memory.memory_counts = state["memory"]
+        print("Resuming after round " + str(self.round) + ".")
+        return True
+
+    def add_edges(self, edges):
+        """
+        Inserts a batch of ``(u, v, weight)`` edges and re-propagates around them from the current labels.
+        """
+        sources, targets, weights = zip(*edges)
+
+        def patch():
+            touched = self.signed_graph.add_edges(sources, targets, weights)
+            if self.graph is not self.signed_graph:
+                for u, v, weight in edges:
+                    self.graph.add_edge(u, v, weight=1 if weight > 0 else -1)
+            return touched
+        self.update_graph(patch)
+
+    def remove_edges(self, edges):
+        """
+        Deletes a batch of ``(u, v)`` edges and re-propagates around them from the current labels. An unknown
+        node raises a KeyError before either graph is changed.
+        """
+        sources, targets = zip(*edges)
+
+        def patch():
+            touched = self.signed_graph.remove_edges(sources, targets)
+            if self.graph is not self.signed_graph:
+                self.graph.remove_edges_from(edges)
+            return touched
+        self.update_graph(patch)
+
+    def update_graph(self, patch):
+        """
+        Applies patch to the SignedGraph and carries the propagation weights over its splice. The weights of the
+        edges incident to the patched endpoints are recomputed from the rows of their endpoints only, in both
+        directions. The endpoints and their neighbors then form the frontier of a warm-started frontier
+        propagation, which stops once no woken node is left without a maximal label.
+        """
+        graph = self.signed_graph
+        touched = patch()
+        self.weights = graph.carry(self.weights)
+        at, owners = row_positions(graph.indptr[touched], graph.indptr[touched + 1] - graph.indptr[touched])
+        rows = touched[owners]
+        cols = graph.indices[at]
+        mirrors, _ = graph.find(cols, rows)
+        stale_edges, inverse = np.unique(graph.edge_index[at], return_inverse=True)
+        stale_weights = local_edge_weights(graph, self.metric.__name__, stale_edges)[inverse.ravel()]
+        self.weights[at] = stale_weights
+        self.weights[mirrors] = stale_weights
+
+        self.rows = None
+        self.sampler = None
+        self.tracker = None
+        # SLPA memories are sized and weighted for the old graph, they restart from the current labels
+        self.memory = None
+        self.active = np.zeros(graph.node_count, dtype=bool)
+        self.active[touched] = True
+        self.active[cols] = True
         index = 0
+        while index < self.rounds:
+            index = index + 1
+            self.round = self.round + 1
+            _, unsatisfied = self.do_a_frontier_propagation()
+            # only a node woken by a move can have lost its maximal label during the round
+            if self.confirm_unsatisfied(unsatisfied, np.flatnonzero(self.active)) == 0:
+                break
+
+    def do_a_series_of_propagations(self):
+        index = self.round
         while index < self.rounds and self.flag:
             index = index + 1
             print("Label propagation round: " + str(index))
+            self.round = index
             self.do_a_propagation()
+            if self.checkpoint is not None and index % self.args.checkpoint_every == 0:
+                self.save_checkpoint()
+        if self.checkpoint is not None:
+            self.checkpoint.wait()
+        if self.engine is not None:
+            self.engine.close()
+            self.engine = None
+        if self.mode == "frontier":
+            print("Frontier sizes: " + str(self.frontier_sizes))
+            print("Edge visits: " + str(self.edge_visits))
+        if self.sampler is not None:
+            print("Hubs sampled: " + str(len(self.sampler.hubs)) + " Edges read per round: " +
+                  str(round(100 * self.sampler.sampled_fraction, 1)) + "%")
+        if self.memory is not None:
+            memberships = self.memory.memberships(self.args.overlap_threshold)
+            overlapping = sum(1 for communities in memberships.values() if len(communities) > 1)
+            print("Overlapping nodes: " + str(overlapping) + " Memory: " + str(self.memory.nbytes) + " bytes")
+            if self.args.membership_output:
+                json_dumper(memberships, self.args.membership_output)
+        if self.args.telemetry_output:
+            json_dumper(self.history, self.args.telemetry_output)
         print("")
         #print("Modularity is: "+  str(round(modularity(self.labels,self.graph),3)) + ".")
         #json_dumper(self.labels, self.args.assignment_output)
 
+def run_and_report(G, args, weights=None):
+    """
+    Runs one propagation and returns the weighting, the mode, the degree cap, the propagation time in seconds and
+    the final labels, aligned to ``SignedGraph.from_networkx(G)``.
+    """
+    model = LabelPropagator(G, args, weights)
+    start = time.time()
+    model.do_a_series_of_propagations()
+    elapsed = time.time() - start
+    return args.weighting, args.mode, args.degree_cap, elapsed, model.signed_graph.labels
+
+def run_ensemble(G, args):
+    """
+    Runs args.ensemble seeds concurrently, prints the stability of the consensus communities and returns the
+    propagation time in seconds and the signed modularity of the consensus partition.
+    """
+    model = LabelPropagator(G, args)
+    start = time.time()
+    seeds = [args.seed + i for i in range(args.ensemble)]
+    labels, stability, iterations = consensus_partition(model.signed_graph, model.weights, args, seeds,
+                                                        args.workers, args.consensus_threshold,
+                                                        args.consensus_rounds)
+    elapsed = time.time() - start
+    print("Consensus partition after " + str(iterations) + " ensemble runs.")
+    for community, value in sorted(stability.items(), key=lambda item: item[1]):
+        print("community: {:<8} stability: {:.3f}".format(model.signed_graph.node_ids[community], value))
+    return elapsed, float(eval.compute_Modularity(G, model.signed_graph.label_map(labels)))
+
 if __name__ == "__main__":
     args = parameter_parser()
     G=graph_reader(args.input)
-    model = LabelPropagator(G, args)
-    model.do_a_series_of_propagations()
-    comMap={}
-    for i in G.nodes:
-        comMap[i]=model.labels[i]
-
-    eval.compute_Modularity(G, comMap)
+    if args.ensemble:
+        elapsed, q = run_ensemble(G, args)
+        print("ensemble of {} time: {:8.3f}s  Q: {:.4f}".format(args.ensemble, elapsed, q))
+        raise SystemExit
+    modes = ["async", "sync", "parallel", "frontier", "slpa"] if args.compare else [args.mode]
+    # a degree cap is reported next to the uncapped run of the same mode
+    caps = [0, args.degree_cap] if args.degree_cap else [0]
+    weightings = args.weighting.split(",")
+    weights = {weightings[0]: None}
+    signed_graph = SignedGraph.from_networkx(G)
+    if len(weightings) > 1:
+        start = time.time()
+        weights = shared_weight_setup(signed_graph, weightings, args)
+        print("Weightings {} in {:.3f}s".format(", ".join(weightings), time.time() - start))
+    report = []
+    for weighting in weightings:
+        args.weighting = weighting
+        for mode in modes:
+            args.mode = mode
+            for cap in caps if mode in ["async", "frontier"] else [0]:
+                args.degree_cap = cap
+                report.append(run_and_report(G, args, weights[weighting]))
+    # the partitions of the sweep are scored together
+    qs = batch_modularity(signed_graph, [labels for _, _, _, _, labels in report], args.workers)
+    for (weighting, mode, cap, elapsed, _), q in zip(report, qs):
+        print("weighting: {:<18} mode: {:<8} cap: {:<6} time: {:8.3f}s  Q: {:.4f}".format(weighting, mode, cap or "-",
+                                                                                      elapsed, q))
+    if args.report_output:
+        truth = ground_truth_reader(args.ground_truth) if args.ground_truth else None
+        records = []
+        for weighting, mode, cap, elapsed, labels in report:
+            record = eval.partition_report(G, signed_graph.label_map(labels), truth)
+            record.update({"weighting": weighting, "mode": mode, "degree_cap": cap, "seconds": elapsed})
+            records.append(record)
+        json_dumper(records, args.report_output)
 
     #create_and_run_model(args)
@@ -1,6 +1,7 @@
 import pandas as pd
 import networkx as nx
 import json
+from signed_graph import SignedGraph
 
 def graph_reader(input_path):
     edges = pd.read_csv(input_path,sep=',',header=None)
@@ -19,6 +20,20 @@ def graph_reader(input_path):
 
     return graph
 
+def signed_graph_reader(input_path):
+    """
+    Reads the same edge list as graph_reader straight into a SignedGraph, without building networkx dicts.
+    """
+    edges = pd.read_csv(input_path,sep=',',header=None)
+    return SignedGraph.from_edge_arrays(edges[0].values, edges[1].values, edges[2].values)
+
+def ground_truth_reader(input_path):
+    """
+    Reads a node,community CSV into ``{node: community}``.
+    """
+    rows = pd.read_csv(input_path,sep=',',header=None)
+    return dict(zip(rows[0].values.tolist(), rows[1].values.tolist()))
+
 def json_dumper(data, path):
     with open(path, 'w') as outfile:
         json.dump(data, outfile)
\ No newline at end of file
@@ -0,0 +1,100 @@
+"""
+Numba-compiled propagation sweeps over the CSR arrays of a SignedGraph.
+
+numba is an optional dependency: without it ``available`` is False and the callers keep their pure Python loops.
+The kernels make the same decisions as those loops, tie breaks included, so both backends give identical labels.
+"""
+import numpy as np
+from rng import GOLDEN, MIX_1, MIX_2
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+available = numba is not None
+
+# scratch arrays of sweep in this process, reused by every call on a graph of the same size
+buffers = {}
+
+
+def jit(function):
+    if numba is None:
+        return function
+    return numba.njit(cache=True, nogil=True)(function)
+
+
+@jit
+def splitmix(value):
+    value = value + np.uint64(GOLDEN)
+    value = (value ^ (value >> np.uint64(30))) * np.uint64(MIX_1)
+    value = (value ^ (value >> np.uint64(27))) * np.uint64(MIX_2)
+    return value ^ (value >> np.uint64(31))
+
+
+def scratch(node_count):
+    """
+    Label score and seen flag arrays of sweep for a graph of node_count nodes, allocated once per process.
+    sweep leaves every seen flag cleared, so the arrays can be handed to the next call as they are.
+    """
+    if buffers.get("node_count") != node_count:
+        buffers["node_count"] = node_count
+        buffers["scores"] = np.zeros(node_count, dtype=np.float64)
+        buffers["seen"] = np.zeros(node_count, dtype=np.bool_)
+    return buffers["scores"], buffers["seen"]
+
+
+@jit
+def sweep(indptr, indices, weights, labels, order, key, active, wake, scores, seen):
+    """
+    Updates the nodes of order one after the other, in place, like the asynchronous loop of LabelPropagator:
+    neighbor weights are summed per label in first-seen order, and the new label is drawn among the maximal
+    ones with ``rng.draw_index(key, node, ties)``. With wake, the neighbors of every node that changed label are
+    flagged in active. scores and seen are the scratch arrays of scratch, so a call costs O(edges of order).
+
+    :return: Number of nodes that changed label and number of nodes whose label was not maximal.
+    """
+    width = 0
+    for node in order:
+        width = max(width, indptr[node + 1] - indptr[node])
+    touched = np.empty(width, dtype=np.int32)
+    top = np.empty(width, dtype=np.int32)
+    changed = 0
+    unsatisfied = 0
+    for node in order:
+        start = indptr[node]
+        end = indptr[node + 1]
+        if start == end:
+            continue
+        count = 0
+        for position in range(start, end):
+            label = labels[indices[position]]
+            if not seen[label]:
+                seen[label] = True
+                scores[label] = 0.0
+                touched[count] = label
+                count += 1
+            scores[label] += weights[position]
+        best = scores[touched[0]]
+        for i in range(1, count):
+            best = max(best, scores[touched[i]])
+        ties = 0
+        maximal = False
+        for i in range(count):
+            label = touched[i]
+            seen[label] = False
+            if scores[label] == best:
+                top[ties] = label
+                ties += 1
+                if label == labels[node]:
+                    maximal = True
+        if not maximal:
+            unsatisfied += 1
+        pick = top[splitmix(np.uint64(key) ^ np.uint64(node)) % np.uint64(ties)]
+        if pick != labels[node]:
+            labels[node] = pick
+            changed += 1
+            if wake:
+                for position in range(start, end):
+                    active[indices[position]] = True
+    return changed, unsatisfied
@@ -1,5 +1,7 @@
 from parser import parameter_parser
 from graph_io import graph_reader
+from signed_graph import SignedGraph
+from signed_scores import LabelScoreTable
 import networkx as nx
 import random
 from tqdm import tqdm
@@ -19,52 +21,31 @@ except ImportError:
 
 
 
-def make_a_pick(G, source, neighbors):
+def make_a_pick(G, scores, source):
     """
     here we pick one community to repeat but we change our pick strategy to dont pick our enemy choice
+    G is a SignedGraph and scores its LabelScoreTable, friends pull source to their labels and enemies push it away
     """
-
-    scores = {}
-    for neighbor in neighbors:
-        #print str(source)+" neighbor is: "
-        #print G[2]
-        #print [n for n in neighbors]
-        neighbor_label = G.nodes[neighbor]['poslabel']
-        mul=1
-        if G[source][neighbor]['weight'] < 0:
-            mul=1
-        if neighbor_label in scores.keys():
-            scores[neighbor_label] = scores[neighbor_label] + G[source][neighbor]['weight']*mul
-        else:
-            scores[neighbor_label] = G[source][neighbor]['weight']*mul
-    top = [key for key, val in scores.iteritems() if val == max(scores.values())]
     global index
     #if len(top)>1 and index>11:
-        #return G.nodes[source]['poslabel']
-    return random.sample(top, 1)[0]
+        #return G.labels[source]
+    return scores.pick(source, G.labels[source])
 
 
-def do_a_propagation(G):
+def do_a_propagation(G, scores):
     """
     """
     #random.seed(1)
     #print G.nodes()
-    p=[i for i in G.nodes()]
+    p=list(range(G.node_count))
     random.shuffle(p)
     print(p[1])
     print(p[2])
     #sys.exit(0)
     for node in tqdm(p):
-        neighbors = G.neighbors(node)
-
-        #print [n for n in neighbors]
-        #print type(neighbors)
-        #print neighbors[2]
-        #print neighbors[2]
-        #print neighbors[2]
-
-        pick = make_a_pick(G,node, neighbors)
-        G.nodes[node]['poslabel'] = pick
+        pick = make_a_pick(G, scores, node)
+        scores.move(node, G.labels[node], pick)
+        G.labels[node] = pick
     #current_label_count = len(set(self.labels.values()))
     #if self.label_count == current_label_count:
     #    self.flag = False
@@ -72,13 +53,13 @@ def do_a_propagation(G):
     #    self.label_count = current_label_count
 
 
-def do_a_series_of_propagations(G):
+def do_a_series_of_propagations(G, scores):
     global index
     index = 0
     while index < 15 :
         index = index + 1
         print("Label propagation round: " + str(index))
-        do_a_propagation(G)
+        do_a_propagation(G, scores)
     print("")
     #print("Modularity is: " + str(round(modularity(self.labels, self.graph), 3)) + ".")
     #json_dumper(self.labels, self.args.assignment_output)
@@ -89,25 +70,11 @@ def create_and_run_model(args):
     #print G.nodes
     #print G.edges
 
-    labels = {i: {'poslabel': i, 'negLabels': -1} for i in G.nodes}
-    #print labels
-    nx.set_node_attributes(G, labels)
-    #print G.nodes[1]['poslabel']
-    #print G.nodes[1]['poslabel']
-    #print G.nodes[1]['poslabel']
-    #print G.nodes[1]['negLabels']
-    #print G.nodes[1]['negLabels']
-    do_a_series_of_propagations(G)
+    SG = SignedGraph.from_networkx(G)
+    do_a_series_of_propagations(SG, LabelScoreTable(SG, args.enemy_weight))
+    comMap = SG.label_map()
     for node in G.nodes:
-        print str(node)+"->"+str(G.nodes[node]['poslabel'])
-
-
-
-    edges, edges_color = zip(*nx.get_edge_attributes(G, 'color').items())
-    print edges_color
-    comMap={}
-    for i in G.nodes:
-        comMap[i]=G.nodes[i]['poslabel']
+        print(str(node)+"->"+str(comMap[node]))
 
     eval.compute_Modularity(G, comMap)
 
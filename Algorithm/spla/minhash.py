@@ -0,0 +1,65 @@
+import numpy as np
+from batch_weights import local_edge_weights, row_positions
+from parallel_weights import parallel_edge_weights
+from rng import stream_key, uniform
+
+# the hash is keyed below round -1, which no propagation round uses
+HASH_ROUND = -1
+
+
+def minhash_signatures(graph, nodes, bins, seed):
+    """
+    One-permutation MinHash signatures of the neighborhoods of nodes. Every neighbor is hashed once into
+    [0, bins); entry b of a row is the smallest hash that falls in bin b, or inf for an empty bin.
+
+    :return: ``(len(nodes), bins)`` float64 array.
+    """
+    lengths = graph.indptr[nodes + 1] - graph.indptr[nodes]
+    positions, owners = row_positions(graph.indptr[nodes], lengths)
+    hashes = uniform(stream_key(seed, HASH_ROUND), graph.indices[positions]) * bins
+    signatures = np.full(len(nodes) * bins, np.inf)
+    np.minimum.at(signatures, owners * bins + hashes.astype(np.int64), hashes)
+    return signatures.reshape(len(nodes), bins)
+
+
+def estimate_jaccard(left, right):
+    """
+    Jaccard index estimated from the signature rows: the share of matching bins among the bins that are not
+    empty in both rows.
+    """
+    filled = np.isfinite(left) | np.isfinite(right)
+    matches = np.count_nonzero((left == right) & filled, axis=1)
+    return matches / np.maximum(np.count_nonzero(filled, axis=1), 1).astype(np.float64)
+
+
+def approximate_normalized_overlap(graph, degree, bins, seed, workers, sample=1000):
+    """
+    normalized_overlap of every undirected edge, estimated from MinHash signatures when both endpoints have more
+    than degree neighbors and computed exactly otherwise. The error of the estimate is measured against the
+    exact Jaccard index of up to sample of the estimated edges.
+
+    :return: float64 weight of every undirected edge and an error report.
+    """
+    degrees = graph.degrees
+    estimated = (degrees[graph.edge_sources] > degree) & (degrees[graph.edge_targets] > degree)
+    exact_edges = np.flatnonzero(~estimated)
+    estimated_edges = np.flatnonzero(estimated)
+    weights = np.zeros(graph.edge_count)
+    weights[exact_edges] = parallel_edge_weights(graph, ["normalized_overlap"], workers, exact_edges)[0]
+
+    hubs, hub_of = np.unique(np.concatenate([graph.edge_sources[estimated_edges],
+                                             graph.edge_targets[estimated_edges]]), return_inverse=True)
+    signatures = minhash_signatures(graph, hubs, bins, seed)
+    sources = hub_of[:len(estimated_edges)]
+    targets = hub_of[len(estimated_edges):]
+    weights[estimated_edges] = estimate_jaccard(signatures[sources], signatures[targets])
+
+    checked = np.random.RandomState(seed).permutation(len(estimated_edges))[:sample]
+    errors = np.abs(weights[estimated_edges[checked]] -
+                    local_edge_weights(graph, "normalized_overlap", estimated_edges[checked]))
+    report = {"estimated_edges": len(estimated_edges),
+              "hubs": len(hubs),
+              "checked_edges": len(checked),
+              "mean_error": float(errors.mean()) if len(errors) else 0.0,
+              "max_error": float(errors.max()) if len(errors) else 0.0}
+    return weights, report
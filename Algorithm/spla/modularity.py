@@ -0,0 +1,156 @@
+import multiprocessing
+import numpy as np
+from parallel import attach_shared, shared, shared_copy
+from batch_weights import row_positions
+
+
+class ModularityTracker(object):
+    """
+    Signed modularity of the labels of a SignedGraph, kept up to date under label moves.
+
+    The tracker holds the positive and negative strength total of every community, the sums of their squares and
+    the signed weight inside communities, counted over ordered node pairs like evaluator.compute_Modularity. A
+    batch of moves only reads the rows of the moved nodes, so a round costs O(sum of their degrees) instead of a
+    full recomputation.
+    """
+
+    def __init__(self, graph, labels):
+        """
+        :param graph: SignedGraph, its edge signs are the modularity weights.
+        :param labels: Label of every node.
+        """
+        self.graph = graph
+        self.rows = graph.csr_rows()
+        weights = graph.weights.astype(np.float64)
+        self.positive = np.bincount(self.rows, weights=np.maximum(weights, 0), minlength=graph.node_count)
+        self.negative = np.bincount(self.rows, weights=np.maximum(-weights, 0), minlength=graph.node_count)
+        self.total_positive = self.positive.sum()
+        self.total_negative = self.negative.sum()
+        self.labels = np.array(labels, dtype=np.int64)
+        self.community_positive = np.bincount(self.labels, weights=self.positive, minlength=graph.node_count)
+        self.community_negative = np.bincount(self.labels, weights=self.negative, minlength=graph.node_count)
+        self.squared_positive = np.square(self.community_positive).sum()
+        self.squared_negative = np.square(self.community_negative).sum()
+        # ordered pairs: an edge inside a community counts from both rows, a self loop from its single entry
+        self.inner = weights[self.labels[self.rows] == self.labels[graph.indices]].sum()
+
+    @property
+    def modularity(self):
+        null = 0.0
+        if self.total_positive:
+            null += self.squared_positive / self.total_positive
+        if self.total_negative:
+            null -= self.squared_negative / self.total_negative
+        return float((self.inner - null) / ((self.total_positive + self.total_negative) or 1.0))
+
+    def move(self, nodes, labels):
+        """
+        Moves the nodes to the given labels, in O(sum of their degrees).
+        """
+        nodes = np.asarray(nodes, dtype=np.int64)
+        labels = np.asarray(labels, dtype=np.int64)
+        keep = self.labels[nodes] != labels
+        nodes, labels = nodes[keep], labels[keep]
+        if not len(nodes):
+            return
+        graph = self.graph
+        old = self.labels[nodes]
+        touched = np.unique(np.concatenate([old, labels]))
+        self.squared_positive -= np.square(self.community_positive[touched]).sum()
+        self.squared_negative -= np.square(self.community_negative[touched]).sum()
+        np.subtract.at(self.community_positive, old, self.positive[nodes])
+        np.subtract.at(self.community_negative, old, self.negative[nodes])
+        np.add.at(self.community_positive, labels, self.positive[nodes])
+        np.add.at(self.community_negative, labels, self.negative[nodes])
+        self.squared_positive += np.square(self.community_positive[touched]).sum()
+        self.squared_negative += np.square(self.community_negative[touched]).sum()
+
+        at, owners = row_positions(graph.indptr[nodes], graph.indptr[nodes + 1] - graph.indptr[nodes])
+        neighbors = graph.indices[at]
+        moved = np.zeros(graph.node_count, dtype=bool)
+        moved[nodes] = True
+        before = self.labels[neighbors] == old[owners]
+        self.labels[nodes] = labels
+        after = self.labels[neighbors] == labels[owners]
+        # an edge to a node that stays put is only seen from the row of the moved endpoint, so it counts twice
+        pairs = np.where(moved[neighbors], 1.0, 2.0)
+        self.inner += (graph.weights[at] * pairs * (after.astype(np.float64) - before)).sum()
+
+    def update(self, labels):
+        """
+        Follows the nodes whose label differs from labels, returns the new modularity.
+        """
+        nodes = np.flatnonzero(self.labels != labels)
+        self.move(nodes, np.asarray(labels)[nodes])
+        return self.modularity
+
+
+def partition_modularity(partitions, sources, targets, pair_weights, positive, negative):
+    """
+    Signed modularity of every row of partitions, a matrix of labels in ``0..node_count - 1``, given the
+    undirected edges of the graph with the weight of their ordered pairs and the positive and negative strength
+    of every node.
+    """
+    count, node_count = partitions.shape
+    inner = np.where(partitions[:, sources] == partitions[:, targets], pair_weights, 0.0).sum(axis=1)
+    flat = (partitions + node_count * np.arange(count)[:, None]).ravel()
+    null = np.zeros(count)
+    for strength, sign in ((positive, 1.0), (negative, -1.0)):
+        total = strength.sum()
+        if total:
+            communities = np.bincount(flat, weights=np.tile(strength, count), minlength=count * node_count)
+            null += sign * np.square(communities.reshape(count, node_count)).sum(axis=1) / total
+    return (inner - null) / ((positive.sum() + negative.sum()) or 1.0)
+
+
+def modularity_block(task):
+    """
+    Writes the modularity of the partitions start:end into the shared output array.
+    """
+    start, end = task
+    node_count = len(shared["positive"])
+    partitions = shared["partitions"][start * node_count:end * node_count].reshape(end - start, node_count)
+    shared["output"][start:end] = partition_modularity(partitions, shared["edge_sources"], shared["edge_targets"],
+                                                       shared["pair_weights"], shared["positive"], shared["negative"])
+
+
+def batch_modularity(graph, partitions, workers=1, budget=1 << 24):
+    """
+    Signed modularity of many partitions of one SignedGraph, equal to evaluator.compute_Modularity of each.
+
+    The strengths and the edge arrays are computed once, and the partitions are evaluated in vectorized
+    blocks of about budget edges, spread over workers processes through shared memory.
+
+    :param partitions: 2-D array with the label of every node in one row per partition.
+    :return: float64 modularity of every partition.
+    """
+    partitions = np.atleast_2d(np.asarray(partitions, dtype=np.int64))
+    if partitions.size and (partitions.min() < 0 or partitions.max() >= graph.node_count):
+        partitions = np.vstack([np.unique(row, return_inverse=True)[1].ravel() for row in partitions])
+    rows = graph.csr_rows()
+    signs = graph.weights.astype(np.float64)
+    loops = graph.edge_sources == graph.edge_targets
+    # an undirected edge stands for both of its ordered pairs, a self loop for one
+    arrays = {"edge_sources": graph.edge_sources,
+              "edge_targets": graph.edge_targets,
+              "pair_weights": np.where(loops, 1.0, 2.0) * graph.edge_signs,
+              "positive": np.bincount(rows, weights=np.maximum(signs, 0), minlength=graph.node_count),
+              "negative": np.bincount(rows, weights=np.maximum(-signs, 0), minlength=graph.node_count),
+              "partitions": partitions.ravel(),
+              "output": np.zeros(len(partitions))}
+    raw_arrays = {name: (shared_copy(array), array.dtype, len(array)) for name, array in arrays.items()}
+    attach_shared(raw_arrays)
+    output = shared["output"]
+    step = max(1, min(budget // max(graph.edge_count, graph.node_count, 1), -(-len(partitions) // workers)))
+    tasks = [(start, min(start + step, len(partitions))) for start in range(0, len(partitions), step)]
+    if workers > 1 and len(tasks) > 1:
+        pool = multiprocessing.Pool(workers, initializer=attach_shared, initargs=(raw_arrays,))
+        try:
+            pool.map(modularity_block, tasks)
+        finally:
+            pool.close()
+            pool.join()
+    else:
+        for task in tasks:
+            modularity_block(task)
+    return np.array(output)
@@ -0,0 +1,143 @@
+import ctypes
+import multiprocessing
+import numpy as np
+from propagation import best_labels
+from rng import draw_index, round_state, stream_key
+import jit_kernels
+
+CTYPES = {np.dtype(np.int32): ctypes.c_int32,
+          np.dtype(np.int64): ctypes.c_int64,
+          np.dtype(np.float64): ctypes.c_double}
+
+# numpy views of the shared arrays, filled by attach_shared in the parent and in every worker
+shared = {}
+
+
+def shared_copy(array):
+    """
+    Copies an array into a multiprocessing.RawArray and returns the raw buffer.
+    """
+    array = np.ascontiguousarray(array)
+    raw = multiprocessing.RawArray(CTYPES[array.dtype], max(len(array), 1))
+    np.frombuffer(raw, dtype=array.dtype)[:len(array)] = array
+    return raw
+
+
+def attach_shared(raw_arrays):
+    """
+    Pool initializer: wraps the shared buffers in numpy views.
+    """
+    for name, (raw, dtype, length) in raw_arrays.items():
+        shared[name] = np.frombuffer(raw, dtype=dtype)[:length]
+
+
+def update_block(task):
+    """
+    Updates the nodes schedule[start:end] in place. They all have the same colour, so no two of them
+    are adjacent and the order of the updates does not matter. Ties are drawn from the stream key of the round
+    by node, so the result does not depend on how the class was split between workers.
+
+    :return: Number of nodes that changed label and number of nodes whose label was not maximal.
+    """
+    start, end, key = task
+    labels = shared["labels"]
+    if jit_kernels.available:
+        return jit_kernels.sweep(shared["indptr"], shared["indices"], shared["weights"], labels,
+                                 shared["schedule"][start:end], np.uint64(key), np.zeros(0, dtype=bool), False,
+                                 *jit_kernels.scratch(len(labels)))
+    changed = 0
+    unsatisfied = 0
+    for node in shared["schedule"][start:end].tolist():
+        top = best_labels(shared["indptr"], shared["indices"], shared["weights"], labels, node)
+        if top:
+            if labels[node] not in top:
+                unsatisfied = unsatisfied + 1
+            pick = top[draw_index(key, node, len(top))]
+            if pick != labels[node]:
+                labels[node] = pick
+                changed = changed + 1
+    return changed, unsatisfied
+
+
+def greedy_coloring(graph):
+    """
+    Colours the nodes, largest degree first, with the smallest colour unused by their neighbors.
+
+    :return: int32 colour of every node.
+    """
+    colors = [-1] * graph.node_count
+    indptr = graph.indptr.tolist()
+    for node in np.argsort(-graph.degrees, kind='mergesort').tolist():
+        taken = set(colors[neighbor] for neighbor in graph.indices[indptr[node]:indptr[node + 1]].tolist())
+        color = 0
+        while color in taken:
+            color = color + 1
+        colors[node] = color
+    return np.array(colors, dtype=np.int32)
+
+
+class ColoredPropagation:
+    """
+    Semi-synchronous propagation over a greedy colouring of the graph.
+    Colour classes are swept one after the other, the nodes of a class are updated in parallel by a process
+    pool working on shared-memory CSR and label arrays. Every sweep is equivalent to an asynchronous round
+    whose order visits the classes in turn.
+    """
+
+    def __init__(self, graph, weights, workers, min_block=2048):
+        """
+        :param graph: SignedGraph, its labels are copied into shared memory.
+        :param weights: Propagation weight of every CSR position.
+        :param workers: Number of worker processes.
+        :param min_block: Classes smaller than this are updated in the parent process.
+        """
+        self.workers = workers
+        self.min_block = min_block
+        self.colors = greedy_coloring(graph)
+        self.color_count = int(self.colors.max()) + 1 if graph.node_count else 0
+        self.class_bounds = np.concatenate([[0], np.cumsum(np.bincount(self.colors, minlength=self.color_count))])
+        self.degrees = graph.degrees
+
+        arrays = {"indptr": graph.indptr,
+                  "indices": graph.indices,
+                  "weights": np.asarray(weights, dtype=np.float64),
+                  "labels": graph.labels,
+                  "schedule": np.argsort(self.colors, kind='mergesort').astype(np.int32)}
+        raw_arrays = {name: (shared_copy(array), array.dtype, len(array)) for name, array in arrays.items()}
+        attach_shared(raw_arrays)
+        self.labels = shared["labels"]
+        self.schedule = shared["schedule"]
+        self.pool = multiprocessing.Pool(workers, initializer=attach_shared, initargs=(raw_arrays,))
+
+    def split(self, start, end):
+        """
+        Cuts schedule[start:end] into one degree-balanced block per worker.
+        """
+        work = np.cumsum(self.degrees[self.schedule[start:end]] + 1)
+        cuts = np.searchsorted(work, work[-1] * np.arange(1, self.workers) / float(self.workers))
+        bounds = np.unique(np.concatenate([[0], cuts, [end - start]])) + start
+        return list(zip(bounds[:-1].tolist(), bounds[1:].tolist()))
+
+    def sweep(self, seed, round_index):
+        """
+        Runs one round over all colour classes in a random order. The outcome only depends on seed and round_index,
+        not on the number of workers.
+
+        :return: Number of nodes that changed label and number of nodes whose label was not maximal.
+        """
+        counts = np.zeros(2, dtype=np.int64)
+        random_state = round_state(seed, round_index)
+        key = stream_key(seed, round_index)
+        for color in random_state.permutation(self.color_count).tolist():
+            start, end = self.class_bounds[color], self.class_bounds[color + 1]
+            random_state.shuffle(self.schedule[start:end])
+            if end - start < self.min_block:
+                counts += update_block((start, end, key))
+            else:
+                tasks = [(a, b, key) for a, b in self.split(start, end)]
+                counts += np.sum(self.pool.map(update_block, tasks), axis=0)
+        return int(counts[0]), int(counts[1])
+
+    def close(self):
+        self.pool.close()
+        self.pool.join()
@@ -0,0 +1,55 @@
+import multiprocessing
+import numpy as np
+from parallel import attach_shared, shared, shared_copy
+from batch_weights import batch_edge_weights, csr_keys, edge_chunks, edge_metrics, squared_norms
+
+
+def weight_block(task):
+    """
+    Writes the metrics of the edges start:end into their rows of the shared output array.
+    """
+    start, end, metric_names = task
+    output = shared["output"].reshape(len(metric_names), -1)
+    output[:, start:end] = edge_metrics(metric_names, shared["csr_indptr"], shared["csr_indices"], shared["csr_keys"],
+                                        shared["csr_signs"], shared["norms"], shared["edge_sources"][start:end],
+                                        shared["edge_targets"][start:end])
+
+
+def parallel_edge_weights(graph, metric_names, workers, edges=None, budget=1 << 22):
+    """
+    Evaluates calculation_helper metrics once per undirected edge of a SignedGraph over a process pool.
+
+    The CSR arrays go to shared memory once and every worker writes its degree-balanced range of edges into a
+    shared output array, so neither the networkx graph nor the results are pickled. All metrics come out of
+    the same common neighbor pass. A single worker runs batch_edge_weights in the calling process.
+
+    :param metric_names: Names of the metrics.
+    :param edges: Ids of the undirected edges to evaluate, all of them by default.
+    :return: float64 array with the weight of every evaluated edge in one row per metric.
+    """
+    if workers <= 1:
+        return batch_edge_weights(graph, metric_names, edges, budget)
+    sources = graph.edge_sources if edges is None else graph.edge_sources[edges]
+    targets = graph.edge_targets if edges is None else graph.edge_targets[edges]
+    degrees = graph.degrees
+    total_work = int((np.minimum(degrees[sources], degrees[targets]) + 1).sum())
+    chunks = max(4 * workers, total_work // budget + 1)
+    arrays = {"csr_indptr": graph.indptr,
+              "csr_indices": graph.indices,
+              "csr_keys": csr_keys(graph),
+              "csr_signs": graph.weights.astype(np.float64),
+              "norms": squared_norms(graph),
+              "edge_sources": sources,
+              "edge_targets": targets,
+              "output": np.zeros(len(metric_names) * len(sources))}
+    raw_arrays = {name: (shared_copy(array), array.dtype, len(array)) for name, array in arrays.items()}
+    attach_shared(raw_arrays)
+    output = shared["output"]
+    tasks = [(start, end, metric_names) for start, end in edge_chunks(graph, sources, targets, chunks)]
+    pool = multiprocessing.Pool(workers, initializer=attach_shared, initargs=(raw_arrays,))
+    try:
+        pool.map(weight_block, tasks)
+    finally:
+        pool.close()
+        pool.join()
+    return np.array(output).reshape(len(metric_names), len(sources))
@@ -1,4 +1,5 @@
 import argparse
+import multiprocessing
 import config as cfg
 
 
@@ -37,7 +38,27 @@ def parameter_parser():
                         default = 'overlap',
                         #default = 'min_norm',
                         #default = 'mea_sim',
-	                help = 'Overlap weighting.')
+	                help = 'Overlap weighting. A comma separated list computes all of them in one pass and runs one propagation per weighting.')
+
+    parser.add_argument('--minhash-degree',
+                        type = int,
+                        default = 0,
+	                help = 'Estimate normalized_overlap from MinHash signatures on edges whose endpoints both have more neighbors than this. Default is 0 (exact).')
+
+    parser.add_argument('--minhash-size',
+                        type = int,
+                        default = 128,
+	                help = 'Number of bins of the one-permutation MinHash signatures of --minhash-degree. Default is 128.')
+
+    parser.add_argument('--weight-cache',
+                        nargs = '?',
+                        default = None,
+	                help = 'Directory caching the weights of every graph and weighting between runs. Default is no cache.')
+
+    parser.add_argument('--weight-cache-size',
+                        type = int,
+                        default = 1024,
+	                help = 'Size of the weight cache in MB, least recently used entries are evicted beyond it. Default is 1024.')
 
     parser.add_argument('--rounds',
                         type = int,
@@ -49,5 +70,104 @@ def parameter_parser():
                         default = 42,
 	                help = 'Random seed. Default is 42.')
 
+    parser.add_argument('--enemy-weight',
+                        type = float,
+                        default = 1.0,
+	                help = 'How hard a negative edge pushes away from the label of its endpoint in main.py. Default is 1.0.')
+
+    parser.add_argument('--convergence-threshold',
+                        type = float,
+                        default = 0.0,
+	                help = 'Stop once at most this fraction of the nodes changed label in a round. Default is 0.0.')
+
+    parser.add_argument('--modularity-patience',
+                        type = int,
+                        default = 0,
+	                help = 'Stop once the signed modularity has not improved for this many rounds. Default is 0 (off).')
+
+    parser.add_argument('--telemetry-output',
+                        nargs = '?',
+                        default = None,
+	                help = 'Path of a JSON dump of the per-round changed nodes, label count and time.')
+
+    parser.add_argument('--checkpoint',
+                        nargs = '?',
+                        default = None,
+	                help = 'Directory of the memory-mapped checkpoints of the run. Default is no checkpoints.')
+
+    parser.add_argument('--checkpoint-every',
+                        type = int,
+                        default = 1,
+	                help = 'Rounds between two checkpoints. Default is 1.')
+
+    parser.add_argument('--resume',
+                        action = 'store_true',
+	                help = 'Continue from the last checkpoint in the --checkpoint directory.')
+
+    parser.add_argument('--mode',
+                        nargs = '?',
+                        default = 'async',
+                        choices = ['async', 'sync', 'parallel', 'frontier', 'slpa'],
+	                help = 'Propagation mode, one node at a time (async), all nodes at once (sync), colour classes over a process pool (parallel), async over the nodes whose neighborhood changed (frontier) or speaker-listener with label memories (slpa). Default is async.')
+
+    parser.add_argument('--damping',
+                        type = float,
+                        default = 0.2,
+	                help = 'Probability that a node keeps its old label in a sync round. Default is 0.2.')
+
+    parser.add_argument('--degree-cap',
+                        type = int,
+                        default = 0,
+	                help = 'In async and frontier mode, nodes with more neighbors than this decide from a weighted sample of that many neighbors, redrawn every round. Sampled hubs rarely settle, so pair it with --convergence-threshold. Default is 0 (no cap).')
+
+    parser.add_argument('--memory-size',
+                        type = int,
+                        default = 8,
+	                help = 'Distinct labels kept in the memory of every node in slpa mode, rarer ones are evicted. Default is 8.')
+
+    parser.add_argument('--overlap-threshold',
+                        type = float,
+                        default = 0.1,
+	                help = 'Share of the memory of a node a label needs to count as one of its communities in slpa mode. Default is 0.1.')
+
+    parser.add_argument('--membership-output',
+                        nargs = '?',
+                        default = None,
+	                help = 'Path of a JSON dump of the overlapping communities of every node in slpa mode.')
+
+    parser.add_argument('--report-output',
+                        nargs = '?',
+                        default = None,
+	                help = 'Path of a JSON dump of the quality report of every run: modularity, frustration, conductance, community sizes and NMI/ARI.')
+
+    parser.add_argument('--ground-truth',
+                        nargs = '?',
+                        default = None,
+	                help = 'Node,community CSV the NMI and ARI of the quality report are measured against.')
+
+    parser.add_argument('--compare',
+                        action = 'store_true',
+	                help = 'Run every propagation mode and report time and modularity side by side.')
+
+    parser.add_argument('--ensemble',
+                        type = int,
+                        default = 0,
+	                help = 'Number of seeds of a consensus ensemble run in parallel. Default is 0 (single run).')
+
+    parser.add_argument('--consensus-threshold',
+                        type = float,
+                        default = 0.5,
+	                help = 'Edges agreed on by fewer runs than this fraction are cut from the consensus graph. Default is 0.5.')
+
+    parser.add_argument('--consensus-rounds',
+                        type = int,
+                        default = 10,
+	                help = 'Maximal number of ensemble runs of the consensus clustering. Default is 10.')
+
+    parser.add_argument('--workers',
+                        type = int,
+                        default = multiprocessing.cpu_count(),
+	                help = 'Worker processes of the parallel mode. Default is the number of cores.')
+
     return parser.parse_args()
 
@@ -0,0 +1,92 @@
+import numpy as np
+from rng import stream_key, uniform
+
+
+def best_labels(indptr, indices, weights, labels, source):
+    """
+    Sums the weights of the CSR row of source per neighbor label and returns the maximal labels.
+    An isolated node gets an empty list.
+    """
+    start = indptr[source]
+    end = indptr[source + 1]
+    if start == end:
+        return []
+    scores = {}
+    for neighbor_label, weight in zip(labels[indices[start:end]].tolist(), weights[start:end].tolist()):
+        scores[neighbor_label] = scores.get(neighbor_label, 0.0) + weight
+    best = max(scores.values())
+    return [key for key, val in scores.items() if val == best]
+
+
+def label_scores(graph, labels, weights, rows):
+    """
+    Scatter-adds the CSR edge weights into (node, label) buckets.
+
+    :param rows: Row id of every CSR position (``np.repeat(arange(n), degrees)``).
+    :return: Bucket rows, bucket labels and bucket scores, sorted by row then label.
+    """
+    keys = rows.astype(np.int64) * graph.node_count + labels[graph.indices]
+    order = np.argsort(keys, kind='mergesort')
+    keys = keys[order]
+    starts = np.flatnonzero(np.concatenate([[True], keys[1:] != keys[:-1]]))
+    scores = np.add.reduceat(weights[order], starts)
+    keys = keys[starts]
+    return keys // graph.node_count, (keys % graph.node_count).astype(np.int32), scores
+
+
+def segmented_argmax(bucket_rows, scores, priority):
+    """
+    Index of the best bucket of every row present in bucket_rows, ties broken by the larger priority.
+    Buckets must be grouped by row.
+    """
+    row_starts = np.flatnonzero(np.concatenate([[True], bucket_rows[1:] != bucket_rows[:-1]]))
+    row_of_bucket = np.repeat(np.arange(len(row_starts)), np.diff(np.append(row_starts, len(bucket_rows))))
+    best = np.maximum.reduceat(scores, row_starts)
+    ranked = np.where(scores == best[row_of_bucket], priority, -np.inf)
+    top = np.maximum.reduceat(ranked, row_starts)
+    winners = np.flatnonzero(ranked == top[row_of_bucket])
+    # a repeated priority would leave two winners in a row, keep the first one
+    keep = np.concatenate([[True], row_of_bucket[winners[1:]] != row_of_bucket[winners[:-1]]])
+    return winners[keep]
+
+
+def unsatisfied_count(graph, labels, weights, rows):
+    """
+    Number of nodes whose label does not have the maximal score in their neighborhood. Isolated nodes count as
+    satisfied.
+    """
+    if graph.edge_count == 0:
+        return 0
+    bucket_rows, bucket_labels, scores = label_scores(graph, labels, weights, rows)
+    row_starts = np.flatnonzero(np.concatenate([[True], bucket_rows[1:] != bucket_rows[:-1]]))
+    row_of_bucket = np.repeat(np.arange(len(row_starts)), np.diff(np.append(row_starts, len(bucket_rows))))
+    best = np.maximum.reduceat(scores, row_starts)
+    holds = (bucket_labels == labels[bucket_rows]) & (scores == best[row_of_bucket])
+    return int(len(row_starts) - np.count_nonzero(holds))
+
+
+def synchronous_sweep(graph, labels, weights, rows, damping, seed, round_index):
+    """
+    One Jacobi-style round: every node picks its best neighbor label from the labels of the previous round.
+
+    Ties between maximal labels are broken at random, but a node whose current label is maximal keeps it.
+    To stop two-colourings from swapping forever a node adopts its new label only with probability
+    ``1 - damping``. Both draws are hashed from (seed, round_index) and the bucket or node they concern.
+
+    :return: New label array, the number of nodes that changed label and the number of nodes whose
+             label was not maximal. Those are the nodes that proposed a move, before damping rejected any.
+    """
+    bucket_rows, bucket_labels, scores = label_scores(graph, labels, weights, rows)
+    priority = uniform(stream_key(seed, round_index, 1), bucket_rows * graph.node_count + bucket_labels)
+    priority[bucket_labels == labels[bucket_rows]] = 2.0
+    winners = segmented_argmax(bucket_rows, scores, priority)
+
+    new_labels = labels.copy()
+    new_labels[bucket_rows[winners]] = bucket_labels[winners]
+    changed = np.flatnonzero(new_labels != labels)
+    unsatisfied = len(changed)
+    if damping > 0:
+        rejected = changed[uniform(stream_key(seed, round_index, 2), changed) < damping]
+        new_labels[rejected] = labels[rejected]
+        changed = np.setdiff1d(changed, rejected, assume_unique=True)
+    return new_labels, len(changed), unsatisfied
@@ -0,0 +1,58 @@
+"""
+Counter-based random streams. Every random decision of a run is a SplitMix64 hash of (seed, round, node, ...)
+instead of a draw from a shared generator, so the outcome does not depend on which thread or process makes the
+decision, or in which order.
+"""
+import numpy as np
+
+MASK = (1 << 64) - 1
+GOLDEN = 0x9E3779B97F4A7C15
+MIX_1 = 0xBF58476D1CE4E5B9
+MIX_2 = 0x94D049BB133111EB
+
+
+def splitmix(value):
+    """
+    SplitMix64 finaliser of a Python int.
+    """
+    value = (value + GOLDEN) & MASK
+    value = ((value ^ (value >> 30)) * MIX_1) & MASK
+    value = ((value ^ (value >> 27)) * MIX_2) & MASK
+    return value ^ (value >> 31)
+
+
+def stream_key(seed, *counters):
+    """
+    64-bit key of the stream identified by seed and counters, e.g. ``stream_key(seed, round_index)``.
+    """
+    key = splitmix(seed & MASK)
+    for counter in counters:
+        key = splitmix(key ^ (counter & MASK))
+    return key
+
+
+def draw_index(key, node, count):
+    """
+    Index in ``range(count)`` drawn by node from the stream key.
+    """
+    return splitmix(key ^ node) % count
+
+
+def round_state(seed, round_index):
+    """
+    RandomState of one round, for the shuffles done in the parent process.
+    """
+    return np.random.RandomState(stream_key(seed, round_index) >> 32)
+
+
+def uniform(key, values):
+    """
+    Vectorised counterpart of draw_index: one float in [0, 1) per entry of the integer array values.
+    """
+    with np.errstate(over="ignore"):
+        value = np.asarray(values).astype(np.uint64) ^ np.uint64(key)
+        value = value + np.uint64(GOLDEN)
+        value = (value ^ (value >> np.uint64(30))) * np.uint64(MIX_1)
+        value = (value ^ (value >> np.uint64(27))) * np.uint64(MIX_2)
+        value = value ^ (value >> np.uint64(31))
+    return (value >> np.uint64(11)).astype(np.float64) / float(1 << 53)
@@ -0,0 +1,93 @@
+import numpy as np
+from rng import uniform
+
+
+def alias_table(weights):
+    """
+    Vose alias table of the distribution proportional to weights: slot i is kept with probability ``prob[i]``
+    and otherwise replaced by ``alias[i]``. A zero total falls back to the uniform distribution.
+    """
+    count = len(weights)
+    total = float(np.sum(weights))
+    prob = (np.asarray(weights, dtype=np.float64) * count / total).tolist() if total > 0 else [1.0] * count
+    alias = list(range(count))
+    small = [i for i in range(count) if prob[i] < 1.0]
+    large = [i for i in range(count) if prob[i] >= 1.0]
+    while small and large:
+        less = small.pop()
+        more = large.pop()
+        alias[less] = more
+        prob[more] = prob[more] + prob[less] - 1.0
+        if prob[more] < 1.0:
+            small.append(more)
+        else:
+            large.append(more)
+    for i in small + large:
+        prob[i] = 1.0
+    return np.array(prob), np.array(alias, dtype=np.int64)
+
+
+class HubSampler(object):
+    """
+    Degree-capped view of the CSR arrays of a SignedGraph.
+
+    Rows with at most cap entries are copied as they are. The row of a hub, a node with more than cap
+    neighbors, is replaced by cap neighbors drawn with probability proportional to the absolute propagation
+    weight, from one alias table per hub, so a draw costs O(1) whatever the degree. A drawn neighbor votes with
+    the sign of its weight times ``total / cap``, which keeps every label score an unbiased estimate of the full one.
+    """
+
+    def __init__(self, graph, weights, cap):
+        """
+        :param graph: SignedGraph.
+        :param weights: Propagation weight of every CSR position.
+        :param cap: Largest neighborhood that is read in full.
+        """
+        self.graph = graph
+        self.source_weights = weights
+        self.cap = cap
+        degrees = graph.degrees
+        self.hubs = np.flatnonzero(degrees > cap)
+        self.indptr = np.zeros(graph.node_count + 1, dtype=np.int64)
+        np.cumsum(np.minimum(degrees, cap), out=self.indptr[1:])
+
+        rows = graph.csr_rows()
+        kept = np.flatnonzero(degrees[rows] <= cap)
+        at = self.indptr[rows[kept]] + kept - graph.indptr[rows[kept]]
+        self.indices = np.zeros(self.indptr[-1], dtype=np.int32)
+        self.weights = np.zeros(self.indptr[-1], dtype=np.float64)
+        self.indices[at] = graph.indices[kept]
+        self.weights[at] = weights[kept]
+
+        self.hub_degrees = degrees[self.hubs]
+        self.table_offsets = np.concatenate([[0], np.cumsum(self.hub_degrees)])
+        tables = [alias_table(np.abs(weights[graph.indptr[hub]:graph.indptr[hub + 1]])) for hub in self.hubs]
+        self.prob = np.concatenate([table[0] for table in tables] + [np.zeros(0)])
+        self.alias = np.concatenate([table[1] for table in tables] + [np.zeros(0, dtype=np.int64)])
+        self.vote = np.array([np.abs(weights[graph.indptr[hub]:graph.indptr[hub + 1]]).sum() / cap
+                              for hub in self.hubs])
+
+    def resample(self, key):
+        """
+        Redraws the rows of all hubs from the stream key, in place.
+        """
+        if len(self.hubs) == 0:
+            return
+        draws = np.arange(len(self.hubs) * self.cap)
+        hub = draws // self.cap
+        slot = draws % self.cap
+        counters = (self.hubs[hub].astype(np.int64) * self.cap + slot) * 2
+        local = (uniform(key, counters) * self.hub_degrees[hub]).astype(np.int64)
+        table = self.table_offsets[hub] + local
+        local = np.where(uniform(key, counters + 1) < self.prob[table], local, self.alias[table])
+        position = self.graph.indptr[self.hubs[hub]] + local
+        at = self.indptr[self.hubs[hub]] + slot
+        self.indices[at] = self.graph.indices[position]
+        self.weights[at] = np.sign(self.source_weights[position]) * self.vote[hub]
+
+    @property
+    def sampled_fraction(self):
+        """
+        Share of the CSR entries that are read per round.
+        """
+        return float(self.indptr[-1]) / max(len(self.graph.indices), 1)
@@ -0,0 +1,260 @@
+import numpy as np
+
+
+def row_search(indptr, indices, rows, cols):
+    """
+    CSR position of cols[i] in the sorted row rows[i], or the position it would be inserted at when it is missing.
+    A vectorized binary search, O(log degree) per pair.
+    """
+    low = indptr[rows].astype(np.int64)
+    high = indptr[np.asarray(rows) + 1].astype(np.int64)
+    searching = low < high
+    while searching.any():
+        middle = (low + high) // 2
+        right = searching & (indices[np.where(searching, middle, 0)] < cols)
+        low = np.where(right, middle + 1, low)
+        high = np.where(searching & ~right, middle, high)
+        searching = low < high
+    return low
+
+
+class SignedGraph(object):
+    """
+    Compact array-backed view of an undirected signed graph.
+
+    Nodes are relabelled to contiguous int32 ids (``node_ids[i]`` is the original name of node ``i``).
+    Every undirected edge is stored once in ``edge_sources``/``edge_targets``/``edge_signs`` and twice
+    in the CSR arrays (once per endpoint row), with ``edge_index`` mapping a CSR position back to its
+    undirected edge. Rows are sorted by neighbor id. add_edges and remove_edges splice their rows into the CSR
+    arrays in place of a rebuild and keep the splice, so carry can align any other per-position array.
+    """
+
+    def __init__(self, node_ids, sources, targets, signs):
+        """
+        :param node_ids: Original node names, indexed by contiguous id.
+        :param sources: Contiguous id of the first endpoint of every undirected edge.
+        :param targets: Contiguous id of the second endpoint of every undirected edge.
+        :param signs: Signed weight of every undirected edge.
+        """
+        self.node_ids = np.asarray(node_ids)
+        self.node_count = len(self.node_ids)
+        self.edge_sources = np.asarray(sources, dtype=np.int32)
+        self.edge_targets = np.asarray(targets, dtype=np.int32)
+        self.edge_signs = np.asarray(signs, dtype=np.float32)
+        self.edge_count = len(self.edge_sources)
+        self.build_csr()
+        self.labels = np.arange(self.node_count, dtype=np.int32)
+        self.index = None
+        self.splice = (None, None)
+
+    @classmethod
+    def from_networkx(cls, graph, weight='weight'):
+        """
+        Builds the array view of a graph returned by ``graph_io.graph_reader``.
+        Node ids follow ``graph.nodes()`` order.
+        """
+        node_ids = list(graph.nodes())
+        index = {node: i for i, node in enumerate(node_ids)}
+        sources = np.empty(graph.number_of_edges(), dtype=np.int32)
+        targets = np.empty(graph.number_of_edges(), dtype=np.int32)
+        signs = np.empty(graph.number_of_edges(), dtype=np.float32)
+        for i, (u, v, w) in enumerate(graph.edges(data=weight, default=1)):
+            sources[i] = index[u]
+            targets[i] = index[v]
+            signs[i] = w
+        return cls(node_ids, sources, targets, signs)
+
+    @classmethod
+    def from_edge_arrays(cls, sources, targets, weights):
+        """
+        Builds the array view from raw edge arrays holding original node names.
+        Weights are reduced to +1/-1 and repeated pairs keep the last occurrence, like ``graph_reader``.
+        """
+        node_ids, inverse = np.unique(np.concatenate([sources, targets]), return_inverse=True)
+        edge_count = len(sources)
+        sources = inverse[:edge_count]
+        targets = inverse[edge_count:]
+        signs = np.where(np.asarray(weights) > 0, 1, -1)
+
+        low = np.minimum(sources, targets).astype(np.int64)
+        high = np.maximum(sources, targets).astype(np.int64)
+        keys = (low * len(node_ids) + high)[::-1]
+        _, last = np.unique(keys, return_index=True)
+        last = edge_count - 1 - last
+        return cls(node_ids, low[last], high[last], signs[last])
+
+    def build_csr(self):
+        """
+        (Re)builds the CSR arrays from the undirected edge arrays. Self loops get a single CSR entry.
+        """
+        edge_ids = np.arange(self.edge_count, dtype=np.int32)
+        loops = self.edge_sources == self.edge_targets
+        rows = np.concatenate([self.edge_sources, self.edge_targets[~loops]])
+        cols = np.concatenate([self.edge_targets, self.edge_sources[~loops]])
+        edge_ids = np.concatenate([edge_ids, edge_ids[~loops]])
+
+        order = np.lexsort((cols, rows))
+        self.indices = cols[order].astype(np.int32)
+        self.edge_index = edge_ids[order].astype(np.int32)
+        self.weights = self.edge_signs[self.edge_index]
+        self.indptr = np.zeros(self.node_count + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=self.node_count), out=self.indptr[1:])
+
+    def node_index(self, names, create=False):
+        """
+        Contiguous ids of original node names. With create, unknown names become new nodes with singleton labels.
+        """
+        if self.index is None:
+            self.index = {name: i for i, name in enumerate(self.node_ids.tolist())}
+        ids = []
+        created = []
+        for name in names:
+            if name not in self.index:
+                if not create:
+                    raise KeyError(name)
+                self.index[name] = len(self.index)
+                created.append(name)
+            ids.append(self.index[name])
+        if created:
+            self.node_ids = np.concatenate([self.node_ids, np.array(created, dtype=self.node_ids.dtype)])
+            self.labels = np.concatenate([self.labels, np.arange(self.node_count, len(self.index), dtype=np.int32)])
+            self.node_count = len(self.index)
+        return np.array(ids, dtype=np.int32)
+
+    def edge_keys(self, sources, targets):
+        """
+        Order-independent int64 key of every (source, target) pair.
+        """
+        low = np.minimum(sources, targets).astype(np.int64)
+        high = np.maximum(sources, targets).astype(np.int64)
+        return low * self.node_count + high
+
+    def find(self, rows, cols):
+        """
+        :return: CSR position of every (rows[i], cols[i]) entry, or the position it would be inserted at, and
+                 whether the entry exists.
+        """
+        at = row_search(self.indptr, self.indices, rows, cols)
+        found = at < self.indptr[np.asarray(rows) + 1]
+        found[found] = self.indices[at[found]] == np.asarray(cols)[found]
+        return at, found
+
+    def add_edges(self, sources, targets, weights):
+        """
+        Inserts edges given in original names, creating unknown nodes. Weights are reduced to +1/-1 and an
+        existing pair gets the new sign, like graph_reader does with repeated rows. The new entries are spliced
+        into the sorted rows, so the cost is one binary search per edge plus a copy of the CSR arrays.
+
+        :return: Ids of the endpoints of the inserted edges.
+        """
+        sources = self.node_index(sources, create=True)
+        targets = self.node_index(targets, create=True)
+        self.indptr = np.concatenate([self.indptr, np.repeat(self.indptr[-1], self.node_count + 1 - len(self.indptr))])
+        signs = np.where(np.asarray(weights) > 0, 1, -1).astype(np.float32)
+        keys = self.edge_keys(sources, targets)
+        _, last = np.unique(keys[::-1], return_index=True)
+        last = len(keys) - 1 - last
+        sources, targets, signs = sources[last], targets[last], signs[last]
+
+        at, found = self.find(sources, targets)
+        mirror, _ = self.find(targets[found], sources[found])
+        self.edge_signs[self.edge_index[at[found]]] = signs[found]
+        self.weights[at[found]] = signs[found]
+        self.weights[mirror] = signs[found]
+
+        new = ~found
+        ids = np.arange(self.edge_count, self.edge_count + np.count_nonzero(new), dtype=np.int32)
+        self.edge_sources = np.concatenate([self.edge_sources, sources[new]])
+        self.edge_targets = np.concatenate([self.edge_targets, targets[new]])
+        self.edge_signs = np.concatenate([self.edge_signs, signs[new]])
+        self.edge_count = len(self.edge_sources)
+
+        loops = sources[new] == targets[new]
+        rows = np.concatenate([sources[new], targets[new][~loops]])
+        cols = np.concatenate([targets[new], sources[new][~loops]])
+        entry_ids = np.concatenate([ids, ids[~loops]])
+        order = np.lexsort((cols, rows))
+        rows, cols, entry_ids = rows[order], cols[order], entry_ids[order]
+        at = row_search(self.indptr, self.indices, rows, cols)
+        self.indices = np.insert(self.indices, at, cols)
+        self.edge_index = np.insert(self.edge_index, at, entry_ids)
+        self.weights = np.insert(self.weights, at, self.edge_signs[entry_ids])
+        self.indptr[1:] += np.cumsum(np.bincount(rows, minlength=self.node_count))
+        self.splice = (at, None)
+        return np.unique(np.concatenate([sources, targets]))
+
+    def remove_edges(self, sources, targets):
+        """
+        Deletes edges given in original names. Nodes are kept, even when they are left isolated. Unknown names
+        raise a KeyError before anything is changed.
+
+        :return: Ids of the endpoints of the removed edges.
+        """
+        sources = self.node_index(sources)
+        targets = self.node_index(targets)
+        at, found = self.find(sources, targets)
+        mirror, _ = self.find(targets[found], sources[found])
+        positions = np.unique(np.concatenate([at[found], mirror]))
+        removed = np.unique(self.edge_index[positions])
+        rows = np.searchsorted(self.indptr, positions, side='right') - 1
+
+        self.indices = np.delete(self.indices, positions)
+        self.weights = np.delete(self.weights, positions)
+        # the edges after a removed one move down by the number of removed ids below them
+        edge_index = np.delete(self.edge_index, positions)
+        self.edge_index = (edge_index - np.searchsorted(removed, edge_index)).astype(np.int32)
+        self.indptr[1:] -= np.cumsum(np.bincount(rows, minlength=self.node_count))
+        self.edge_sources = np.delete(self.edge_sources, removed)
+        self.edge_targets = np.delete(self.edge_targets, removed)
+        self.edge_signs = np.delete(self.edge_signs, removed)
+        self.edge_count = len(self.edge_sources)
+        self.splice = (None, positions)
+        return np.unique(np.concatenate([sources, targets]))
+
+    def carry(self, values, fill=0.0):
+        """
+        Aligns an array over the CSR positions before the last add_edges or remove_edges to the current ones.
+        Inserted positions get fill.
+        """
+        inserted, deleted = self.splice
+        if inserted is not None:
+            return np.insert(values, inserted, fill)
+        if deleted is not None:
+            return np.delete(values, deleted)
+        return values
+
+    def csr_rows(self):
+        """
+        Row id of every CSR position.
+        """
+        return np.repeat(np.arange(self.node_count, dtype=np.int32), self.degrees)
+
+    @property
+    def degrees(self):
+        return np.diff(self.indptr)
+
+    @property
+    def nbytes(self):
+        """
+        Memory held by the graph arrays, in bytes.
+        """
+        arrays = [self.edge_sources, self.edge_targets, self.edge_signs, self.indices,
+                  self.edge_index, self.weights, self.indptr, self.labels]
+        return sum(array.nbytes for array in arrays)
+
+    def neighbors(self, node):
+        return self.indices[self.indptr[node]:self.indptr[node + 1]]
+
+    def edge_weights(self, weights):
+        """
+        Spreads weights kept once per undirected edge over the CSR positions, both endpoint rows get the weight
+        of their edge.
+        """
+        return np.asarray(weights, dtype=np.float64)[self.edge_index]
+
+    def label_map(self, labels=None):
+        """
+        Returns ``{node: label}`` in original node names.
+        """
+        labels = self.labels if labels is None else labels
+        return dict(zip(self.node_ids.tolist(), self.node_ids[labels].tolist()))
@@ -0,0 +1,100 @@
+import random
+
+
+class LabelScoreTable(object):
+    """
+    Per-node label scores of a signed graph, kept up to date as labels move.
+
+    ``positive[u][l]`` is the summed weight of the positive edges between u and the neighbors labelled l and
+    ``negative[u][l]`` the summed absolute weight of the negative ones. A label move of node v touches only the
+    tables of the neighbors of v, so a pick never rescans a neighborhood. The table also counts the nodes holding
+    every label, so a node that leaves its community can take a label nobody holds.
+    """
+
+    def __init__(self, graph, enemy_weight=1.0):
+        """
+        :param graph: SignedGraph, its current labels seed the tables.
+        :param enemy_weight: How hard a negative edge pushes away from the label of its endpoint.
+        """
+        self.graph = graph
+        self.enemy_weight = enemy_weight
+        self.positive = [{} for _ in range(graph.node_count)]
+        self.negative = [{} for _ in range(graph.node_count)]
+        labels = graph.labels.tolist()
+        self.sizes = [0] * graph.node_count
+        for label in labels:
+            self.sizes[label] += 1
+        # labels nobody holds, entries taken since are skipped when popped
+        self.free = [label for label in range(graph.node_count) if self.sizes[label] == 0]
+        indptr = graph.indptr.tolist()
+        for node in range(graph.node_count):
+            neighbors = graph.indices[indptr[node]:indptr[node + 1]].tolist()
+            weights = graph.weights[indptr[node]:indptr[node + 1]].tolist()
+            for neighbor, weight in zip(neighbors, weights):
+                self.add(node, labels[neighbor], weight)
+
+    def add(self, node, label, weight):
+        table = self.positive[node] if weight > 0 else self.negative[node]
+        table[label] = table.get(label, 0.0) + abs(weight)
+
+    def score(self, node, label):
+        return self.positive[node].get(label, 0.0) - self.enemy_weight * self.negative[node].get(label, 0.0)
+
+    def move(self, node, old_label, new_label):
+        """
+        Moves node from old_label to new_label in the tables of its neighbors.
+        """
+        if old_label == new_label:
+            return
+        self.sizes[old_label] -= 1
+        self.sizes[new_label] += 1
+        if self.sizes[old_label] == 0:
+            self.free.append(old_label)
+        start = self.graph.indptr[node]
+        end = self.graph.indptr[node + 1]
+        positive = self.positive
+        negative = self.negative
+        for neighbor, weight in zip(self.graph.indices[start:end].tolist(), self.graph.weights[start:end].tolist()):
+            if weight > 0:
+                table = positive[neighbor]
+            else:
+                table = negative[neighbor]
+                weight = -weight
+            left = table[old_label] - weight
+            if left > 0:
+                table[old_label] = left
+            else:
+                del table[old_label]
+            table[new_label] = table.get(new_label, 0.0) + weight
+
+    def unused_label(self):
+        """
+        A label no node holds. One exists whenever a node shares its label, which is the only case a node leaves.
+        """
+        while self.free and self.sizes[self.free[-1]]:
+            self.free.pop()
+        return self.free[-1] if self.free else None
+
+    def pick(self, node, current):
+        """
+        Best label of node: among the labels of its friends, the ones with the highest friend minus enemy score.
+        When no friend label scores above zero the node keeps its label, unless its own community has turned
+        hostile, in which case it leaves for a singleton label nobody else holds.
+        """
+        best = 0.0
+        top = []
+        enemies = self.negative[node]
+        for label, friends in self.positive[node].items():
+            value = friends - self.enemy_weight * enemies.get(label, 0.0)
+            if value > best:
+                best = value
+                top = [label]
+            elif value == best and top:
+                top.append(label)
+        if top:
+            return top[random.randrange(len(top))]
+        if self.score(node, current) < 0:
+            singleton = self.unused_label()
+            if singleton is not None:
+                return singleton
+        return current
@@ -0,0 +1,108 @@
+import numpy as np
+from propagation import label_scores, segmented_argmax
+from rng import stream_key, uniform
+
+
+class SpeakerListener(object):
+    """
+    Speaker-listener label propagation (SLPA) with bounded label memories.
+
+    Every node keeps a histogram of the labels it has heard in two ``(node_count, memory_size)`` int32 arrays,
+    ``memory_labels`` and ``memory_counts``, with -1 marking an empty slot. In a round every node speaks one label
+    drawn from its memory in proportion to the counts, and every node listens to the label with the highest
+    weight among the ones its neighbors spoke. A heard label missing from a full memory evicts the rarest one,
+    so the memory never exceeds ``node_count * memory_size`` slots however many rounds are run.
+    """
+
+    def __init__(self, graph, weights, memory_size=8):
+        """
+        :param graph: SignedGraph, its current labels seed the memories.
+        :param weights: Propagation weight of every CSR position.
+        :param memory_size: Number of distinct labels kept per node.
+        """
+        self.graph = graph
+        self.weights = weights
+        self.memory_labels = np.full((graph.node_count, memory_size), -1, dtype=np.int32)
+        self.memory_counts = np.zeros((graph.node_count, memory_size), dtype=np.int32)
+        self.memory_labels[:, 0] = graph.labels
+        self.memory_counts[:, 0] = 1
+        self.nodes = np.arange(graph.node_count)
+        self.rows = graph.csr_rows()
+
+    def speak(self, key):
+        """
+        Label spoken by every node, drawn from its memory in proportion to the counts.
+        """
+        cumulative = np.cumsum(self.memory_counts, axis=1)
+        draw = (uniform(key, self.nodes) * cumulative[:, -1]).astype(np.int64)
+        slots = np.count_nonzero(cumulative <= draw[:, None], axis=1)
+        return self.memory_labels[self.nodes, slots]
+
+    def listen(self, spoken, key):
+        """
+        Label heard by every node: the spoken label with the highest positive weight in its neighborhood, ties
+        broken at random. Nodes without such a label hear -1.
+        """
+        heard = np.full(self.graph.node_count, -1, dtype=np.int32)
+        if self.graph.edge_count == 0:
+            return heard
+        bucket_rows, bucket_labels, scores = label_scores(self.graph, spoken, self.weights, self.rows)
+        priority = uniform(key, bucket_rows * self.graph.node_count + bucket_labels)
+        winners = segmented_argmax(bucket_rows, scores, priority)
+        winners = winners[scores[winners] > 0]
+        heard[bucket_rows[winners]] = bucket_labels[winners]
+        return heard
+
+    def memorize(self, heard):
+        """
+        Counts every heard label in the memory of its listener. A new label takes an empty slot, or replaces
+        the rarest label when the memory is full.
+        """
+        listeners = np.flatnonzero(heard >= 0)
+        heard = heard[listeners]
+        match = self.memory_labels[listeners] == heard[:, None]
+        known = match.any(axis=1)
+        self.memory_counts[listeners[known], match[known].argmax(axis=1)] += 1
+        listeners = listeners[~known]
+        slots = self.memory_counts[listeners].argmin(axis=1)
+        self.memory_labels[listeners, slots] = heard[~known]
+        self.memory_counts[listeners, slots] = 1
+
+    def dominant(self):
+        """
+        Most frequent label in the memory of every node.
+        """
+        return self.memory_labels[self.nodes, self.memory_counts.argmax(axis=1)]
+
+    def step(self, seed, round_index):
+        """
+        Runs one speaker-listener round and points the graph labels at the dominant memory labels.
+
+        :return: Number of nodes whose dominant label changed and number of nodes that heard a label other than
+                 their dominant one.
+        """
+        previous = self.graph.labels
+        spoken = self.speak(stream_key(seed, round_index, 1))
+        heard = self.listen(spoken, stream_key(seed, round_index, 2))
+        self.memorize(heard)
+        self.graph.labels = self.dominant()
+        unsatisfied = np.count_nonzero((heard >= 0) & (heard != previous))
+        return int(np.count_nonzero(self.graph.labels != previous)), int(unsatisfied)
+
+    def memberships(self, threshold):
+        """
+        Overlapping communities: every label that holds at least threshold of the memory of a node.
+
+        :return: ``{node: [labels]}`` in original node names, the dominant label first.
+        """
+        order = np.argsort(-self.memory_counts, axis=1, kind='mergesort')
+        labels = self.memory_labels[self.nodes[:, None], order]
+        counts = self.memory_counts[self.nodes[:, None], order]
+        kept = counts >= threshold * counts.sum(axis=1)[:, None]
+        kept[:, 0] = True
+        names = self.graph.node_ids
+        return dict(zip(names.tolist(), [names[row[mask]].tolist() for row, mask in zip(labels, kept)]))
+
+    @property
+    def nbytes(self):
+        return self.memory_labels.nbytes + self.memory_counts.nbytes
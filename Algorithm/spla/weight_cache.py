@@ -0,0 +1,66 @@
+import hashlib
+import os
+import numpy as np
+from checkpoint import replace
+
+
+def fingerprint(graph):
+    """
+    SHA-1 of the node names and the CSR arrays of a SignedGraph, which fix the order of its weight arrays.
+    """
+    digest = hashlib.sha1()
+    if graph.node_ids.dtype.kind == "O":
+        digest.update(repr(graph.node_ids.tolist()).encode("utf-8"))
+    else:
+        digest.update(np.ascontiguousarray(graph.node_ids).tobytes())
+    for array in (graph.indptr, graph.indices, graph.weights):
+        digest.update(np.ascontiguousarray(array).tobytes())
+    return digest.hexdigest()
+
+
+class WeightCache(object):
+    """
+    Directory of propagation weight arrays keyed by graph fingerprint and metric name.
+
+    Every entry is a ``.npy`` file that is memory-mapped on load. A hit refreshes the modification time of its
+    file, and a store evicts the least recently used entries until the directory fits in max_bytes.
+    """
+
+    def __init__(self, path, max_bytes):
+        self.path = path
+        self.max_bytes = max_bytes
+        if not os.path.isdir(path):
+            os.makedirs(path)
+
+    def file(self, graph, metric_name):
+        return os.path.join(self.path, fingerprint(graph) + "_" + metric_name + ".npy")
+
+    def load(self, graph, metric_name):
+        """
+        :return: Read-only memory map of the cached weights, or None on a miss.
+        """
+        path = self.file(graph, metric_name)
+        if not os.path.exists(path):
+            return None
+        os.utime(path, None)
+        return np.load(path, mmap_mode="r")
+
+    def store(self, graph, metric_name, weights):
+        path = self.file(graph, metric_name)
+        with open(path + ".tmp", "wb") as handle:
+            np.save(handle, weights)
+        replace(path + ".tmp", path)
+        self.evict()
+
+    def evict(self):
+        """
+        Deletes the least recently used entries while the cache holds more than max_bytes.
+        """
+        entries = [os.path.join(self.path, name) for name in os.listdir(self.path) if name.endswith(".npy")]
+        entries = sorted((os.path.getmtime(entry), os.path.getsize(entry), entry) for entry in entries)
+        total = sum(size for _, size, _ in entries)
+        for _, size, entry in entries:
+            if total <= self.max_bytes:
+                break
+            os.remove(entry)
+            total = total - size
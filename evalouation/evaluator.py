@@ -1,3 +1,5 @@
+import math
+import random
 import networkx as nx
 
 
@@ -8,53 +10,256 @@ import networkx as nx
 
 
 def compute_Modularity(G,comunityMap,weights='weight',isSigned=True):
-    w_p = {int(n): 0.0 for n in G.nodes}
-    w_n = {int(n): 0.0 for n in G.nodes}
-
-    for wi in G.nodes():
-        for wj in G.neighbors(wi):
-            if G.edges[wi, wj]['weight'] > 0:
-                w_p[wi] += G.edges[wi, wj]['weight']
-                #w_p[wi] += 1
-            else:
-                if G.edges[wi, wj]['weight'] < 0 :
-                    w_n[wi] -= G.edges[wi, wj]['weight']
-                    #w_n[wi] += 1
-    wt_n=sum(w_n.values())
-    wt_p=sum(w_p.values())
-
-    sum_ = 0.0
-    min_= 0.0
-    min_2= 0.0
-
-    for i in G.nodes():
-        for j in G.nodes():
-            negative_noise=((w_n[i] * 1.0 * w_n[j]) / ( wt_n))
-            if G.has_edge(i,j):
-                if  (comunityMap[i] == comunityMap[j]):
-                    sum_ += G.edges[i, j]['weight'] - (  ((w_p[i] * 1.0 * w_p[j]) / ( wt_p))- negative_noise )
-            else:
-                #min_+= - (  ((w_p[i] * 1.0 * w_p[j]) / ( wt_p))- ((w_n[i] * 1.0 * w_n[j]) / ( wt_n)) )
-                if  (comunityMap[i] == comunityMap[j]):
-                    min_2 += - (((w_p[i] * 1.0 * w_p[j]) / (wt_p)) -negative_noise)
-                    #min_2 += - (((w_p[i] * 1.0 * w_p[j]) / (wt_p)) - ((w_n[i] * 1.0 * w_n[j]) / (wt_n)))
-
-    normfacto=1.0/((wt_p+wt_n))
-
-    """
-    print "parameters",
-    print "wn",sum(w_n.values())
-    print "wt_n",wt_n,w_n
-    print "w_p",sum(w_p.values())
-    print "wt_p",wt_p,w_p
-    print normfacto
-    print wt_n
-    print wt_p
-    """
-    #print "final Q singed is:" + str (normfacto*sum_)
-    #print normfacto*(sum_+min_)
-    #print normfacto*(sum_-min_)
-    #print
-    #print normfacto*(sum_-min_2)
-    print "Evaluatin moulde final Q singed is:" + str(normfacto*(sum_+min_2))
-    return str(normfacto*(sum_+min_2))
\ No newline at end of file
+    """
+    Signed modularity of the partition comunityMap of G, in one pass over the edges.
+
+    Q sums, over the ordered node pairs (i, j) of a same community, the edge weight minus the null model
+    w_p[i] * w_p[j] / wt_p - w_n[i] * w_n[j] / wt_n, where w_p and w_n are the positive and negative strengths.
+    The null model of a community c sums in closed form to W_p[c] ** 2 / wt_p - W_n[c] ** 2 / wt_n from the
+    strength totals of its nodes, so the cost is O(m + C) instead of a loop over all n ** 2 pairs.
+    """
+    strengths = SignedStrengths(comunityMap)
+    for _ in strengths.edges(G):
+        pass
+    q = strengths.modularity()
+    print("Evaluatin moulde final Q singed is:" + str(q))
+    return str(q)
+
+
+class SignedStrengths(object):
+    """
+    Positive and negative strength of every group of nodes, their totals, and the signed weight inside groups,
+    accumulated while the edges are walked. An edge is seen from both endpoints as an ordered pair, a self loop
+    once, like in the n ** 2 pair loop of signed modularity.
+    """
+
+    def __init__(self, group):
+        """
+        :param group: ``{node: group}``, a partition for modularity or every node its own group for node strengths.
+        """
+        self.group = group
+        self.positive = {}
+        self.negative = {}
+        self.total_positive = 0.0
+        self.total_negative = 0.0
+        self.inner = 0.0
+
+    def edges(self, G):
+        """
+        Iterates over the edges of G as ``(i, j, weight, pairs)``, pairs being the number of ordered pairs of the
+        edge, adding each edge on the way.
+        """
+        for i, j, weight in G.edges(data='weight'):
+            ends = [i] if i == j else [i, j]
+            if self.group[i] == self.group[j]:
+                self.inner += weight * len(ends)
+            for node in ends:
+                key = self.group[node]
+                if weight > 0:
+                    self.positive[key] = self.positive.get(key, 0.0) + weight
+                    self.total_positive += weight
+                elif weight < 0:
+                    self.negative[key] = self.negative.get(key, 0.0) - weight
+                    self.total_negative -= weight
+            yield i, j, weight, len(ends)
+
+    def modularity(self):
+        return signed_modularity(self.inner, self.positive, self.negative, self.total_positive,
+                                 self.total_negative)
+
+
+def signed_modularity(inner, community_p, community_n, wt_p, wt_n):
+    """
+    Signed modularity from the internal weight over ordered pairs, the positive and negative strength of every
+    community and the strength totals.
+    """
+    null = 0.0
+    if wt_p:
+        null += sum(total * total for total in community_p.values()) / wt_p
+    if wt_n:
+        null -= sum(total * total for total in community_n.values()) / wt_n
+    normfacto=1.0/((wt_p+wt_n) or 1.0)
+    return normfacto*(inner-null)
+
+
+def partition_report(G, comunityMap, groundTruth=None):
+    """
+    Quality record of the partition comunityMap of G, from one pass over the edges and one over the nodes.
+
+    Frustration counts the negative edges inside communities plus the positive edges between them. Conductance
+    of a community is its cut over the smaller of its volume and the volume of the rest of the graph. With a
+    ground truth ``{node: community}``, NMI (arithmetic normalization) and ARI are computed over the nodes it
+    covers from a sparse contingency table.
+
+    :return: dict of the scores, the scores against the ground truth are None without one.
+    """
+    strengths = SignedStrengths(comunityMap)
+    volume = {}
+    cut = {}
+    frustrated = 0
+    edges = 0
+
+    for i, j, weight, _ in strengths.edges(G):
+        same = comunityMap[i] == comunityMap[j]
+        edges += 1
+        if weight < 0 and same or weight > 0 and not same:
+            frustrated += 1
+        for node in [i, j]:
+            community = comunityMap[node]
+            volume[community] = volume.get(community, 0) + 1
+            if not same:
+                cut[community] = cut.get(community, 0) + 1
+
+    sizes = {}
+    contingency = {}
+    for node in G.nodes():
+        community = comunityMap[node]
+        sizes[community] = sizes.get(community, 0) + 1
+        if groundTruth is not None and node in groundTruth:
+            pair = (community, groundTruth[node])
+            contingency[pair] = contingency.get(pair, 0) + 1
+
+    total_volume = 2 * edges
+    conductance = []
+    for community in sizes:
+        smaller = min(volume.get(community, 0), total_volume - volume.get(community, 0))
+        conductance.append(cut.get(community, 0) / float(smaller) if smaller else 0.0)
+    histogram = {}
+    for size in sizes.values():
+        histogram[size] = histogram.get(size, 0) + 1
+
+    report = {"modularity": strengths.modularity(),
+              "frustration": frustrated,
+              "frustration_ratio": frustrated / float(edges) if edges else 0.0,
+              "mean_conductance": sum(conductance) / len(conductance) if conductance else 0.0,
+              "max_conductance": max(conductance) if conductance else 0.0,
+              "communities": len(sizes),
+              "min_size": min(sizes.values()) if sizes else 0,
+              "max_size": max(sizes.values()) if sizes else 0,
+              "mean_size": float(G.number_of_nodes()) / len(sizes) if sizes else 0.0,
+              "size_histogram": histogram,
+              "nmi": None,
+              "ari": None}
+    if groundTruth is not None:
+        report["nmi"], report["ari"] = contingency_scores(contingency)
+    return report
+
+
+def contingency_scores(contingency):
+    """
+    NMI and ARI of two partitions given their sparse contingency table ``{(community, truth): count}``.
+    Two partitions that both put all nodes together, or that agree exactly, score 1.0.
+    """
+    rows = {}
+    columns = {}
+    for (community, truth), count in contingency.items():
+        rows[community] = rows.get(community, 0) + count
+        columns[truth] = columns.get(truth, 0) + count
+    n = float(sum(contingency.values()))
+    if not n:
+        return None, None
+
+    entropy_rows = -sum(a / n * math.log(a / n) for a in rows.values())
+    entropy_columns = -sum(b / n * math.log(b / n) for b in columns.values())
+    information = sum(c / n * math.log(n * c / (rows[community] * columns[truth]))
+                      for (community, truth), c in contingency.items())
+    mean_entropy = (entropy_rows + entropy_columns) / 2
+    nmi = information / mean_entropy if mean_entropy > 0 else 1.0
+
+    index = sum(pair_count(c) for c in contingency.values())
+    row_pairs = sum(pair_count(a) for a in rows.values())
+    column_pairs = sum(pair_count(b) for b in columns.values())
+    expected = row_pairs * column_pairs / pair_count(n) if n > 1 else 0.0
+    maximum = (row_pairs + column_pairs) / 2
+    ari = (index - expected) / (maximum - expected) if maximum != expected else 1.0
+    return nmi, ari
+
+
+def pair_count(size):
+    return size * (size - 1) / 2.0
+
+
+def normal_quantile(p):
+    """
+    Quantile of the standard normal distribution, by bisection on math.erf.
+    """
+    low, high = -10.0, 10.0
+    for _ in range(100):
+        middle = (low + high) / 2
+        if 0.5 * (1 + math.erf(middle / math.sqrt(2))) < p:
+            low = middle
+        else:
+            high = middle
+    return (low + high) / 2
+
+
+class SampledModularity(object):
+    """
+    Signed modularity estimated from a stratified uniform edge sample, for graphs too large for a pass over the
+    edges per candidate partition.
+
+    The positive and the negative edges are two strata sampled without replacement once, with sizes proportional
+    to the strata, so the same sample serves every partition. The internal weight is estimated from the sample,
+    while the null model uses the exact community strength totals from one pass over the nodes. The sample size
+    bounds the half-width of the confidence interval by error even for the worst case partition.
+    """
+
+    def __init__(self, G, error=0.01, confidence=0.95, seed=0):
+        """
+        :param error: Requested half-width of the confidence interval of Q.
+        :param confidence: Confidence level of the interval.
+        :param seed: Seed of the edge sample.
+        """
+        self.z = normal_quantile(0.5 + confidence / 2.0)
+        # every node is its own group, which leaves the strength of every node
+        self.strengths = SignedStrengths(dict((node, node) for node in G.nodes()))
+        strata = {1: [], -1: []}
+        largest = 0.0
+        for i, j, weight, pairs in self.strengths.edges(G):
+            if weight:
+                # weight over the ordered pairs of the edge, added to the internal weight when i and j agree
+                strata[1 if weight > 0 else -1].append((i, j, weight * pairs))
+                largest = max(largest, abs(weight) * pairs)
+
+        edges = len(strata[1]) + len(strata[-1])
+        normfacto = 1.0 / ((self.strengths.total_positive + self.strengths.total_negative) or 1.0)
+        # a sampled value lies between 0 and +-largest, so its standard deviation is at most largest / 2
+        wanted = (self.z * edges * largest / 2 * normfacto / error) ** 2
+        size = wanted / (1 + wanted / edges) if edges else 0
+        generator = random.Random(seed)
+        self.strata = []
+        for stratum in strata.values():
+            if stratum:
+                count = min(len(stratum), max(2, int(math.ceil(size * len(stratum) / edges))))
+                self.strata.append((len(stratum), generator.sample(stratum, count)))
+
+    @property
+    def sample_size(self):
+        return sum(len(sample) for _, sample in self.strata)
+
+    def estimate(self, comunityMap):
+        """
+        :return: Estimated signed modularity of the partition comunityMap, and the low and high ends of its
+                 confidence interval.
+        """
+        inner = 0.0
+        variance = 0.0
+        for population, sample in self.strata:
+            values = [value if comunityMap[i] == comunityMap[j] else 0.0 for i, j, value in sample]
+            mean = sum(values) / len(values)
+            inner += population * mean
+            if len(values) < population:
+                spread = sum((value - mean) ** 2 for value in values) / (len(values) - 1)
+                variance += population ** 2 * spread / len(values) * (1 - len(values) / float(population))
+
+        community_p = {}
+        community_n = {}
+        strengths = self.strengths
+        for node_strengths, totals in ((strengths.positive, community_p), (strengths.negative, community_n)):
+            for node, strength in node_strengths.items():
+                community = comunityMap[node]
+                totals[community] = totals.get(community, 0.0) + strength
+        total = strengths.total_positive + strengths.total_negative
+        q = signed_modularity(inner, community_p, community_n, strengths.total_positive, strengths.total_negative)
+        half = self.z * math.sqrt(variance) / (total or 1.0)
+        return q, q - half, q + half